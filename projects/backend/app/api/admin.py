@@ -2,21 +2,97 @@
 
 from __future__ import annotations
 
-from typing import Annotated
+import json
+from typing import Annotated, AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from app.auth import TokenPayload, require_admin
+from app.config import get_settings
 from app.domain.models import SetRoleRequest, SetRoleResponse
 from app.usecases import roles_uc
 
 router = APIRouter()
 
+_NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
 
 @router.post("/role", response_model=SetRoleResponse)
 async def set_role(
     body: SetRoleRequest,
     _admin: Annotated[TokenPayload, Depends(require_admin)],
 ) -> SetRoleResponse:
-    msg = await roles_uc.set_role(body.address, body.role.value)
-    return SetRoleResponse(ok=True, message=msg)
+    return await roles_uc.set_role(body.address, body.role.value, wait=body.wait)
+
+
+def _too_large(what: str) -> HTTPException:
+    return HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, f"upload exceeds {what}")
+
+
+def _decode(line: bytes) -> str:
+    try:
+        return line.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "upload is not valid UTF-8")
+
+
+async def _iter_lines(request: Request, max_bytes: int) -> AsyncIterator[str]:
+    """Split the streamed request body into text lines; 413 once it passes ``max_bytes``."""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise _too_large(f"{max_bytes} bytes")
+    buf = b""
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise _too_large(f"{max_bytes} bytes")
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            yield _decode(line)
+    if buf:
+        yield _decode(buf)
+
+
+@router.post("/roles/bulk")
+async def bulk_set_roles(
+    request: Request,
+    _admin: Annotated[TokenPayload, Depends(require_admin)],
+    fmt: Optional[str] = Query(None, alias="format", pattern=r"^(csv|ndjson)$"),
+) -> StreamingResponse:
+    """Bulk role import from a streamed CSV (``address,role``) or NDJSON body.
+
+    The whole upload is read before the response starts, so it is capped at
+    ``roles_bulk_max_bytes`` and ``roles_uc.MAX_BULK_ROWS`` rows (413 beyond
+    either) and must be UTF-8 (400 otherwise).  The response streams NDJSON
+    progress records, one per row, then a summary record.
+    """
+    if fmt is None:
+        ctype = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        if ctype in _NDJSON_TYPES:
+            fmt = "ndjson"
+        elif ctype in ("text/csv", "text/plain", ""):
+            fmt = "csv"
+        else:
+            raise HTTPException(
+                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, "expected text/csv or application/x-ndjson"
+            )
+
+    # Drain the body before responding: a streaming response may also read
+    # from the ASGI receive channel (disconnect detection).
+    lines: list[str] = []
+    rows = 0
+    async for line in _iter_lines(request, get_settings().roles_bulk_max_bytes):
+        if line.strip():
+            rows += 1
+            if rows > roles_uc.MAX_BULK_ROWS + 1:  # + optional CSV header
+                raise _too_large(f"{roles_uc.MAX_BULK_ROWS} rows")
+        lines.append(line)
+
+    async def _progress() -> AsyncIterator[bytes]:
+        async for record in roles_uc.bulk_import(lines, fmt):
+            yield json.dumps(record).encode() + b"\n"
+
+    return StreamingResponse(_progress(), media_type="application/x-ndjson")
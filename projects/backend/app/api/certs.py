@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app.auth import TokenPayload, get_current_user
 from app.domain.models import CertListResponse, CertVerifyResponse
@@ -17,12 +17,17 @@ router = APIRouter()
 async def list_certs(
     user: Annotated[TokenPayload, Depends(get_current_user)],
     limit: int = Query(100, ge=1, le=500),
-    offset: int = Query(0, ge=0),
-) -> CertListResponse:
+    cursor: str | None = Query(None, max_length=512),
+) -> Response:
     """List certs.  Students see their own; faculty/admin see all."""
-    if user.role == "student":
-        return await certs_uc.list_for_address(user.address, limit=limit)
-    return await certs_uc.list_all(limit=limit, offset=offset)
+    try:
+        if user.role == "student":
+            body = await certs_uc.list_for_address_json(user.address, limit=limit, cursor=cursor)
+        else:
+            body = await certs_uc.list_json(limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/verify", response_model=CertVerifyResponse)
@@ -7,10 +7,12 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.auth import TokenPayload, require_faculty
 from app.domain.models import (
+    BatchIssueCertRequest,
+    CertJobStatus,
     CreatePollRequest,
     CreateSessionRequest,
     IssueCertRequest,
@@ -48,3 +50,24 @@ async def issue_cert(
 ) -> IssueCertResponse:
     """Faculty issues a certificate: BFF mints ASA/NFT + registers on-chain."""
     return await certificate_uc.issue(body)
+
+
+@router.post("/cert/issue/batch", response_model=CertJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def issue_cert_batch(
+    body: BatchIssueCertRequest,
+    _fac: Annotated[TokenPayload, Depends(require_faculty)],
+) -> CertJobStatus:
+    """Faculty issues many certificates as a background job; poll the returned handle."""
+    return await certificate_uc.issue_batch(body.certs)
+
+
+@router.get("/cert/jobs/{job_id}", response_model=CertJobStatus)
+async def get_cert_job(
+    job_id: str,
+    _fac: Annotated[TokenPayload, Depends(require_faculty)],
+) -> CertJobStatus:
+    """Progress of a batch issuance job."""
+    result = certificate_uc.get_job(job_id)
+    if result is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "job not found")
+    return result
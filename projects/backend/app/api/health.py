@@ -1,10 +1,42 @@
-"""GET /health – simple liveness check."""
+"""GET /health – simple liveness check, plus /health/metrics for internal counters."""
 
 from fastapi import APIRouter
 
+from app.auth import token_cache_stats
+from app.infra.algorand.gateway import get_gateway
+from app.infra.algorand.params import get_params_cache
+from app.infra.algorand.rounds import get_round_watcher
+from app.infra.db.database import pool_stats
+from app.infra.db.models import get_metadata_cache, get_role_cache
+from app.infra.nonces import get_nonce_store
+from app.infra.signatures import get_verifier
+from app.rate_limit import rate_limit_stats
+from app.usecases import analytics_uc, polls_uc, sessions_uc, tx_uc
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health() -> dict:
     return {"status": "ok", "service": "algocampus-bff"}
+
+
+@router.get("/health/metrics")
+async def metrics() -> dict:
+    """Cache / pool counters for the BFF's hot paths."""
+    return {
+        "latest_round": get_round_watcher().latest,
+        "chain_gateway": get_gateway().stats(),
+        "db": pool_stats(),
+        "suggested_params": get_params_cache().stats(),
+        "analytics_cache": analytics_uc.get_summary_cache().stats(),
+        "poll_results_cache": polls_uc.get_results_cache().stats(),
+        "roster_cache": sessions_uc.get_roster_cache().stats(),
+        "tx_watcher": tx_uc.watcher_stats(),
+        "nonces": get_nonce_store().stats(),
+        "role_cache": get_role_cache().stats(),
+        "metadata_cache": get_metadata_cache().stats(),
+        "rate_limit": rate_limit_stats(),
+        "jwt_cache": token_cache_stats(),
+        "signatures": get_verifier().stats(),
+    }
@@ -1,21 +1,36 @@
-"""Local ARC-3 metadata serving – no external calls."""
+"""Local ARC-3 metadata serving – no external calls.
 
-from __future__ import annotations
+A certificate's metadata is derived from the hashed payload, so the document
+for a given hash never changes: the stored bytes are served as-is from an LRU
+with the hash as a strong ETag and a long-lived ``Cache-Control``.
+"""
 
-import json
+from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Header, HTTPException, Response, status
 
-from app.infra.db.models import get_cert_metadata
+from app.infra.db.models import get_cert_metadata_bytes
 
 router = APIRouter()
 
+_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
 
 @router.get("/cert/{cert_hash}.json")
-async def serve_metadata(cert_hash: str) -> JSONResponse:
+async def serve_metadata(
+    cert_hash: str,
+    if_none_match: str | None = Header(None),
+) -> Response:
     """Serve ARC-3 metadata from local SQLite store.  No Pinata / IPFS needed."""
-    raw = await get_cert_metadata(cert_hash)
-    if raw is None:
+    body = await get_cert_metadata_bytes(cert_hash)
+    if body is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "metadata not found")
-    return JSONResponse(content=json.loads(raw), media_type="application/json")
+    headers = {"ETag": f'"{cert_hash}"', "Cache-Control": _CACHE_CONTROL}
+    if if_none_match and _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
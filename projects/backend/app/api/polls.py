@@ -2,25 +2,47 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, status
+import logging
 
-from app.domain.models import PollListResponse, PollResponse
+from algosdk.error import AlgodHTTPError, AlgodResponseError
+from fastapi import APIRouter, HTTPException, Query, Response, status
+
+from app.domain.models import PollListResponse, PollResponse, PollResultsResponse
 from app.usecases import polls_uc
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
 @router.get("", response_model=PollListResponse)
 async def list_polls(
     limit: int = Query(100, ge=1, le=500),
-    offset: int = Query(0, ge=0),
-) -> PollListResponse:
-    return await polls_uc.list_all(limit=limit, offset=offset)
+    cursor: str | None = Query(None, max_length=512),
+) -> Response:
+    try:
+        body = await polls_uc.list_json(limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{poll_id}", response_model=PollResponse)
-async def get_poll(poll_id: int) -> PollResponse:
-    result = await polls_uc.get_by_id(poll_id)
+async def get_poll(poll_id: int) -> Response:
+    body = await polls_uc.get_json(poll_id)
+    if body is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "poll not found")
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/{poll_id}/results", response_model=PollResultsResponse)
+async def get_poll_results(poll_id: int) -> PollResultsResponse:
+    """Live tallies read from the VotingContract's vote-count boxes."""
+    try:
+        result = await polls_uc.results(poll_id)
+    except (AlgodHTTPError, AlgodResponseError, OSError) as exc:  # OSError covers URLError / timeouts
+        logger.warning("poll %d results unavailable: %s", poll_id, exc)
+        raise HTTPException(status.HTTP_502_BAD_GATEWAY, "algod unavailable — try again shortly")
     if result is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "poll not found")
     return result
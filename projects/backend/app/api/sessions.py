@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, status
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.domain.models import SessionListResponse, SessionResponse
 from app.usecases import sessions_uc
@@ -13,14 +17,50 @@ router = APIRouter()
 @router.get("", response_model=SessionListResponse)
 async def list_sessions(
     limit: int = Query(100, ge=1, le=500),
-    offset: int = Query(0, ge=0),
-) -> SessionListResponse:
-    return await sessions_uc.list_all(limit=limit, offset=offset)
+    cursor: str | None = Query(None, max_length=512),
+) -> Response:
+    try:
+        body = await sessions_uc.list_json(limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc))
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{session_id}", response_model=SessionResponse)
-async def get_session(session_id: int) -> SessionResponse:
-    result = await sessions_uc.get_by_id(session_id)
-    if result is None:
+async def get_session(session_id: int) -> Response:
+    body = await sessions_uc.get_json(session_id)
+    if body is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "session not found")
+    return Response(content=body, media_type="application/json")
+
+
+_ROSTER_CHUNK = 500
+
+
+async def _roster_lines(pages: AsyncIterator[list[str]], fmt: str) -> AsyncIterator[bytes]:
+    if fmt == "csv":
+        yield b"address\n"
+    async for addresses in pages:
+        for i in range(0, len(addresses), _ROSTER_CHUNK):
+            chunk = addresses[i:i + _ROSTER_CHUNK]
+            if fmt == "csv":
+                yield "".join(f"{a}\n" for a in chunk).encode()
+            else:
+                yield "".join(json.dumps({"address": a}) + "\n" for a in chunk).encode()
+
+
+@router.get("/{session_id}/roster")
+async def get_roster(
+    session_id: int,
+    fmt: str = Query("csv", alias="format", pattern=r"^(csv|ndjson)$"),
+) -> StreamingResponse:
+    """Checked-in addresses, enumerated from the AttendanceContract roster boxes.
+
+    Closed sessions come sorted from the roster cache; open sessions are
+    streamed page by page as algod lists the boxes.
+    """
+    pages = await sessions_uc.roster(session_id)
+    if pages is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "session not found")
-    return result
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(_roster_lines(pages, fmt), media_type=media_type)
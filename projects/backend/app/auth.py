@@ -1,9 +1,17 @@
-"""JWT helpers and FastAPI dependency for authenticated routes."""
+"""JWT helpers and FastAPI dependency for authenticated routes.
+
+Verified tokens are remembered in a bounded LRU keyed by a digest of the
+token, until the token's ``exp``, so repeat requests with the same bearer token
+skip the HMAC check and claim parsing.  The cache is cleared when the signing
+secret or algorithm changes.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import time
-from typing import Annotated
+from collections import OrderedDict
+from typing import Annotated, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -45,16 +53,89 @@ class TokenPayload:
         self.role = role
 
 
+class _TokenCache:
+    def __init__(self) -> None:
+        self._entries: OrderedDict[bytes, tuple[float, TokenPayload]] = OrderedDict()
+        self._key_id: Optional[tuple[str, str]] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_key(self, settings: Settings) -> None:
+        key_id = (settings.jwt_secret, settings.jwt_algorithm)
+        if key_id != self._key_id:
+            if self._key_id is not None:
+                self.invalidate()
+            self._key_id = key_id
+
+    def get(self, digest: bytes, settings: Settings) -> Optional[TokenPayload]:
+        self._check_key(settings)
+        entry = self._entries.get(digest)
+        if entry is not None:
+            if time.time() < entry[0]:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[1]
+            del self._entries[digest]
+        self.misses += 1
+        return None
+
+    def put(self, digest: bytes, exp: float, payload: TokenPayload, settings: Settings) -> None:
+        self._entries[digest] = (exp, payload)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > settings.jwt_cache_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+_token_cache = _TokenCache()
+
+
+def verify_token(token: str, settings: Settings | None = None) -> TokenPayload:
+    """Validate ``token`` (cached until its ``exp``); raises 401 when invalid."""
+    s = settings or get_settings()
+    digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _token_cache.get(digest, s)
+    if cached is not None:
+        return cached
+    data = _decode(token, s)
+    addr = data.get("sub")
+    if not addr:
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "missing sub")
+    payload = TokenPayload(address=addr, role=data.get("role", "student"))
+    if "exp" in data:
+        _token_cache.put(digest, float(data["exp"]), payload, s)
+    return payload
+
+
+def token_subject(token: str, settings: Settings | None = None) -> str | None:
+    """``sub`` of a valid token, or None — for callers that must not raise."""
+    try:
+        return verify_token(token, settings).address
+    except HTTPException:
+        return None
+
+
+def token_cache_stats() -> dict[str, int]:
+    return _token_cache.stats()
+
+
 async def get_current_user(
     creds: Annotated[HTTPAuthorizationCredentials, Depends(_bearer)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> TokenPayload:
-    data = _decode(creds.credentials, settings)
-    addr = data.get("sub")
-    role = data.get("role", "student")
-    if not addr:
-        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "missing sub")
-    return TokenPayload(address=addr, role=role)
+    return verify_token(creds.credentials, settings)
 
 
 async def require_admin(user: Annotated[TokenPayload, Depends(get_current_user)]) -> TokenPayload:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from pathlib import Path
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -21,16 +22,102 @@ class Settings(BaseSettings):
     kmd_server: str = "http://localhost"
     kmd_port: int = 4002
     kmd_token: str = "a" * 64
+    # Optional local key file for the dev signer (skips KMD entirely)
+    signer_keystore_path: str = ""
+
+    # ── Chain gateway (blocking SDK calls run off the loop) ─
+    chain_max_workers: int = 16
+    algod_max_concurrency: int = 8
+    # confirmations / long-polls, on their own threads (the round watcher holds one)
+    algod_wait_max_concurrency: int = 8
+    indexer_max_concurrency: int = 4
+    kmd_max_concurrency: int = 2
+    chain_call_timeout: float = 60.0
+    # Max age of cached suggested params when no new block has been seen
+    suggested_params_ttl: float = 30.0
+    # Batch cert issuance: 16-txn groups kept in flight at once
+    cert_batch_inflight_groups: int = 4
+
+    # ── Tx confirmation watcher ──────────────────────────
+    tx_watch_timeout: float = 60.0   # give up (status=failed) after this long
+
+    # ── Analytics ingestion ──────────────────────────────
+    analytics_ingest_interval: float = 5.0
+    # Summary cache is keyed by round; this bounds staleness when no blocks arrive
+    analytics_cache_max_age: float = 10.0
+    # Polls whose live results are kept (recomputed once per new round)
+    poll_results_cache_size: int = 256
+    # ...and this bounds their staleness when no new block arrives
+    poll_results_cache_max_age: float = 10.0
+    # Rosters of closed attendance sessions kept in memory (immutable once closed)
+    roster_cache_size: int = 256
 
     # ── JWT ──────────────────────────────────────────────
     jwt_secret: str = "algocampus-local-dev-secret-change-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 60
+    jwt_cache_size: int = 10_000  # verified tokens remembered until their exp
+
+    # Wallet-signature checks run on their own thread pool; a batch window > 0
+    # verifies logins arriving within it together
+    sig_verify_workers: int = 4
+    sig_verify_batch_window_ms: float = 0.0
+    sig_verify_batch_max: int = 64
+
+    # Auth nonces: "sqlite" (shared, durable) or "memory" (single node only)
+    nonce_backend: Literal["sqlite", "memory"] = "sqlite"
+    nonce_ttl_seconds: float = 300.0
+    nonce_sweep_interval: float = 60.0
+    nonce_sweep_batch: int = 1000
+    nonce_memory_max_entries: int = 100_000
+
+    # Role lookups are cached in-process; writes through the BFF invalidate
+    # immediately, the TTL bounds staleness for edits made behind its back
+    role_cache_size: int = 10_000
+    role_cache_ttl: float = 60.0
+    roles_bulk_max_bytes: int = 1_048_576  # /admin/roles/bulk upload cap (413 beyond it)
+
+    # ARC-3 metadata documents kept in memory (LRU, by count)
+    metadata_cache_size: int = 4096
+
+    # ── Rate limiting ────────────────────────────────────
+    # path prefix -> (bucket capacity, refill tokens/sec), per JWT subject or client IP
+    rate_limit_policies: dict[str, tuple[float, float]] = {
+        "/auth/": (20.0, 2.0),
+        "/admin/": (20.0, 2.0),
+        "/faculty/": (20.0, 2.0),
+    }
+    # path prefix -> tokens per write request (longest prefix wins, default 1); reads cost 1
+    rate_limit_costs: dict[str, float] = {
+        "/faculty/cert/issue/batch": 10.0,
+        "/faculty/cert/issue": 5.0,
+        "/faculty/polls": 3.0,
+        "/faculty/sessions": 3.0,
+        "/admin/roles/bulk": 10.0,
+        "/admin/role": 3.0,
+    }
+    # path prefix -> max concurrent POST/PUT/PATCH/DELETE requests (per process, or
+    # across all workers with the shared backend)
+    rate_limit_concurrency: dict[str, int] = {"/faculty/": 4}
+    rate_limit_max_buckets: int = 100_000  # per policy; least recently used dropped first
+    # "memory" (per process) or "shared" (mmap table shared by all workers on the host)
+    rate_limit_backend: Literal["memory", "shared"] = "memory"
+    rate_limit_shared_path: str = ".data/ratelimit.bin"
 
     # ── Paths ────────────────────────────────────────────
     app_manifest_path: str = "../contracts/smart_contracts/artifacts/app_manifest.json"
     db_path: str = ".data/algocampus.db"
 
+    # ── SQLite tuning (WAL + read pool) ──────────────────
+    db_read_pool_size: int = 4
+    db_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    db_cache_size_kib: int = 16384
+    db_mmap_size: int = 256 * 1024 * 1024
+    db_busy_timeout_ms: int = 5000
+    # Group commit: collect writes for up to this long / this many per transaction
+    db_commit_window_ms: float = 2.0
+    db_commit_batch_size: int = 256
+
     # ── BFF base URL (for local metadata serving) ────────
     bff_base_url: str = "http://localhost:8000"
 
@@ -46,11 +46,13 @@ class MeResponse(BaseModel):
 class SetRoleRequest(BaseModel):
     address: str = Field(..., min_length=58, max_length=58)
     role: Role
+    wait: bool = True  # False → return right after submit; poll /tx/track/{tx_id}
 
 
 class SetRoleResponse(BaseModel):
     ok: bool
     message: str
+    tx_id: Optional[str] = None
 
 
 # ── Transaction tracking ─────────────────────────────────
@@ -101,6 +103,20 @@ class PollResponse(BaseModel):
 class PollListResponse(BaseModel):
     polls: list[PollResponse]
     count: int
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page
+
+
+class PollOptionResult(BaseModel):
+    index: int
+    option: str
+    votes: int
+
+
+class PollResultsResponse(BaseModel):
+    poll_id: int
+    round: int  # confirmed round the counts were read at
+    total_votes: int
+    results: list[PollOptionResult]
 
 
 # ── Attendance sessions ──────────────────────────────────
@@ -127,6 +143,7 @@ class SessionResponse(BaseModel):
 class SessionListResponse(BaseModel):
     sessions: list[SessionResponse]
     count: int
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page
 
 
 # ── Certificate issuance ─────────────────────────────────
@@ -146,6 +163,24 @@ class IssueCertResponse(BaseModel):
     tx_id: str
 
 
+class BatchIssueCertRequest(BaseModel):
+    certs: list[IssueCertRequest] = Field(..., min_length=1, max_length=5000)
+
+
+class CertJobStatus(BaseModel):
+    job_id: str
+    status: str  # queued | running | done | partial | failed | cancelled
+    total: int
+    minted: int = 0
+    registered: int = 0
+    failed: int = 0
+    results: list[IssueCertResponse] = Field(default_factory=list)
+    errors: list[dict] = Field(default_factory=list)
+    skipped: list[dict] = Field(default_factory=list)  # in-batch duplicates, issued once
+    created: Optional[float] = None
+    finished: Optional[float] = None
+
+
 class CertListItem(BaseModel):
     cert_hash: str
     recipient: str
@@ -156,6 +191,7 @@ class CertListItem(BaseModel):
 class CertListResponse(BaseModel):
     certs: list[CertListItem]
     count: int
+    next_cursor: Optional[str] = None  # pass as ?cursor= for the next page
 
 
 class CertVerifyResponse(BaseModel):
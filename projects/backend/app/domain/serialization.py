@@ -0,0 +1,47 @@
+"""Fast JSON encoding of BFF-cache rows for the list/detail endpoints.
+
+Rows read back from our own tables already satisfy the response models, so
+they are encoded straight to JSON bytes (pydantic-core's Rust encoder) instead
+of being validated into models and re-validated by ``response_model``.
+Columns that already hold encoded JSON (``polls.options_json``) are spliced
+into the output verbatim rather than parsed and re-encoded.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class RowEncoder:
+    """Encode rows as the JSON form of ``model``.
+
+    ``raw`` maps a response field to the column holding its pre-encoded JSON.
+    """
+
+    def __init__(self, model: type[BaseModel], raw: Optional[Mapping[str, str]] = None):
+        raw = raw or {}
+        self._fields = tuple(f for f in model.model_fields if f not in raw)
+        self._raw = tuple((f',"{field}":'.encode(), column) for field, column in raw.items())
+
+    def encode(self, row: Mapping[str, Any]) -> bytes:
+        head = to_json({f: row.get(f) for f in self._fields})
+        if not self._raw:
+            return head
+        parts = [head[:-1]]  # reopen the object
+        for prefix, column in self._raw:
+            parts += (prefix, row[column].encode())
+        parts.append(b"}")
+        return b"".join(parts)
+
+    def encode_page(self, key: str, rows: list[Mapping[str, Any]], next_cursor: Optional[str]) -> bytes:
+        """``{"<key>": [...], "count": n, "next_cursor": ...}`` as in the *ListResponse models."""
+        return b"".join((
+            b'{"', key.encode(), b'":[',
+            b",".join(self.encode(r) for r in rows),
+            b'],"count":', str(len(rows)).encode(),
+            b',"next_cursor":', to_json(next_cursor),
+            b"}",
+        ))
@@ -0,0 +1,66 @@
+"""Direct application-box reads through algod.
+
+Reading a box is one REST call with no transaction or simulation involved, so
+a contract's per-item state (vote counts, …) can be fetched as one concurrent
+burst instead of an ABI getter call per item.  Calls go through the chain
+gateway, which bounds how many hit algod at once.
+
+``iter_box_names`` pages through an app's box names.  The ``prefix``/``next``
+filters are honoured by recent algod releases.  Names are also filtered here,
+so the result is the same against an algod that ignores those filters and
+returns every name in one response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from typing import AsyncIterator, Optional, Sequence
+
+from algosdk.error import AlgodHTTPError
+
+from app.infra.algorand.client import get_algod
+from app.infra.algorand.gateway import run_algod
+
+
+def itob(n: int) -> bytes:
+    """TEAL ``itob``: 8-byte big-endian uint64."""
+    return n.to_bytes(8, "big")
+
+
+def btoi(b: bytes) -> int:
+    return int.from_bytes(b, "big")
+
+
+async def read_box(app_id: int, name: bytes) -> Optional[bytes]:
+    """Raw value of box ``name``, or None if the box does not exist."""
+    try:
+        resp = await run_algod(get_algod().application_box_by_name, app_id, name)
+    except AlgodHTTPError as exc:
+        if exc.code == 404:
+            return None
+        raise
+    return base64.b64decode(resp["value"])
+
+
+async def read_boxes(app_id: int, names: Sequence[bytes]) -> list[Optional[bytes]]:
+    """Read many boxes concurrently; values come back in ``names`` order."""
+    return list(await asyncio.gather(*(read_box(app_id, n) for n in names)))
+
+
+async def iter_box_names(app_id: int, prefix: bytes = b"", *, page_size: int = 1000) -> AsyncIterator[list[bytes]]:
+    """Yield pages of box names of ``app_id`` that start with ``prefix``."""
+    algod = get_algod()
+    params: dict[str, object] = {"max": page_size}
+    if prefix:
+        params["prefix"] = "b64:" + base64.b64encode(prefix).decode()
+    while True:
+        resp = await run_algod(
+            algod.algod_request, "GET", f"/applications/{app_id}/boxes", params=dict(params)
+        )
+        names = [base64.b64decode(b["name"]) for b in resp.get("boxes", [])]
+        yield [n for n in names if n.startswith(prefix)]
+        token = resp.get("next-token")
+        if not token:
+            return
+        params["next"] = token
@@ -1,20 +1,24 @@
 """High-level helpers for BFF → on-chain ABI calls via ATC (LocalNet dev account).
 
 All calls use the KMD dev account as sender (it is the contract admin post-deploy).
+Every blocking SDK call goes through the chain gateway so the event loop stays free
+while a write waits for confirmation.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
+from algosdk import encoding, transaction
 from algosdk.abi import Method
-from algosdk.atomic_transaction_composer import (
-    AccountTransactionSigner,
-    AtomicTransactionComposer,
-)
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+from algosdk.transaction import SuggestedParams
 
-from app.infra.algorand.client import get_algod, get_app_ids, get_localnet_default_account
+from app.infra.algorand.client import get_algod, get_app_ids
+from app.infra.algorand.gateway import run_algod, run_algod_wait
+from app.infra.algorand.params import get_suggested_params
+from app.infra.algorand.signer import DevAccount, get_dev_account
 
 logger = logging.getLogger(__name__)
 
@@ -33,33 +37,32 @@ _SET_FACULTY = Method.from_signature("set_faculty(address,bool)void")
 # ── Helpers ──────────────────────────────────────────────
 
 
-def _atc_call(app_id: int, method: Method, args: list[Any], *, wait: int = 4) -> Any:
+async def _atc_call(app_id: int, method: Method, args: list[Any], *, wait: int = 4) -> Any:
     """Execute a single ABI method call via ATC using the dev account.
 
-    Returns the ABI return value of the first method result.
+    Returns (ABI return value of the first method result, tx_id).
     """
     algod = get_algod()
-    sender, sk = get_localnet_default_account()
-    sp = algod.suggested_params()
-    signer = AccountTransactionSigner(sk)
+    acct = await get_dev_account()
+    sp = await get_suggested_params()
 
     atc = AtomicTransactionComposer()
     atc.add_method_call(
         app_id=app_id,
         method=method,
-        sender=sender,
+        sender=acct.address,
         sp=sp,
-        signer=signer,
+        signer=acct.signer,
         method_args=args,
     )
-    result = atc.execute(algod, wait_rounds=wait)
+    result = await run_algod_wait(atc.execute, algod, wait)
     return result.abi_results[0].return_value, result.tx_ids[0]
 
 
 # ── Voting ───────────────────────────────────────────────
 
 
-def create_poll_on_chain(
+async def create_poll_on_chain(
     question: str,
     options: list[str],
     start_round: int,
@@ -68,14 +71,14 @@ def create_poll_on_chain(
     """Create a poll on VotingContract. Returns (poll_id, tx_id)."""
     ids = get_app_ids()
     app_id = ids["VotingContract"]
-    ret, tx_id = _atc_call(app_id, _CREATE_POLL, [question, options, start_round, end_round])
+    ret, tx_id = await _atc_call(app_id, _CREATE_POLL, [question, options, start_round, end_round])
     return int(ret), tx_id
 
 
 # ── Attendance ───────────────────────────────────────────
 
 
-def create_session_on_chain(
+async def create_session_on_chain(
     course_code: str,
     session_ts: int,
     open_round: int,
@@ -84,14 +87,14 @@ def create_session_on_chain(
     """Create a session on AttendanceContract. Returns (session_id, tx_id)."""
     ids = get_app_ids()
     app_id = ids["AttendanceContract"]
-    ret, tx_id = _atc_call(app_id, _CREATE_SESSION, [course_code, session_ts, open_round, close_round])
+    ret, tx_id = await _atc_call(app_id, _CREATE_SESSION, [course_code, session_ts, open_round, close_round])
     return int(ret), tx_id
 
 
 # ── Certificate verification (read-only) ────────────────
 
 
-def verify_cert_on_chain(cert_hash_bytes: bytes) -> dict | None:
+async def verify_cert_on_chain(cert_hash_bytes: bytes) -> dict | None:
     """Call verify_cert on CertificateRegistryContract.
 
     Returns {"recipient": str, "asset_id": int, "issued_ts": int} or None.
@@ -101,7 +104,7 @@ def verify_cert_on_chain(cert_hash_bytes: bytes) -> dict | None:
     if not app_id:
         return None
     try:
-        ret, _ = _atc_call(app_id, _VERIFY_CERT, [cert_hash_bytes])
+        ret, _ = await _atc_call(app_id, _VERIFY_CERT, [cert_hash_bytes])
         # ret is a tuple (address_str, asset_id_int, issued_ts_int)
         return {
             "recipient": ret[0],
@@ -115,26 +118,118 @@ def verify_cert_on_chain(cert_hash_bytes: bytes) -> dict | None:
 
 # ── Role management (push to all contracts) ──────────────
 
+_ROLE_METHODS = {"admin": _SET_ADMIN, "faculty": _SET_FACULTY}
+_ROLE_BOX_PREFIX = {"admin": b"adm", "faculty": b"fac"}
 
-def push_role_on_chain(address: str, role: str) -> str | None:
-    """Push admin/faculty role to all deployed contracts. Returns last tx_id."""
+
+def _add_role_call(
+    atc: AtomicTransactionComposer,
+    acct: DevAccount,
+    sp: SuggestedParams,
+    app_id: int,
+    address: str,
+    role: str,
+) -> None:
+    """Append one set_admin/set_faculty call (with its allow-list box ref) to ``atc``."""
+    box_key = _ROLE_BOX_PREFIX[role] + encoding.decode_address(address)
+    atc.add_method_call(
+        app_id=app_id,
+        method=_ROLE_METHODS[role],
+        sender=acct.address,
+        sp=sp,
+        signer=acct.signer,
+        method_args=[address, True],
+        boxes=[(app_id, box_key)],
+    )
+
+
+async def push_role_on_chain(address: str, role: str, *, wait: bool = True) -> str | None:
+    """Push admin/faculty role to all deployed contracts in one atomic group.
+
+    With ``wait=False`` the group is only submitted; the caller tracks the
+    returned tx_id.  Returns the first tx_id of the group, or None if skipped.
+    """
     try:
         ids = get_app_ids()
     except FileNotFoundError:
         logger.warning("App manifest not found — skipping on-chain role push")
         return None
 
-    method = _SET_ADMIN if role == "admin" else _SET_FACULTY if role == "faculty" else None
-    if method is None:
+    if role not in _ROLE_METHODS or not ids:
         return None  # students don't need on-chain registration
 
-    last_tx: str | None = None
-    for name, app_id in ids.items():
+    algod = get_algod()
+    try:
+        acct = await get_dev_account()
+        sp = await get_suggested_params()
+        atc = AtomicTransactionComposer()
+        for app_id in ids.values():
+            _add_role_call(atc, acct, sp, app_id, address, role)
+        if wait:
+            tx_ids = (await run_algod_wait(atc.execute, algod, 4)).tx_ids
+        else:
+            tx_ids = await run_algod(atc.submit, algod)
+    except Exception:
+        logger.exception("Failed to push role=%s for %s to apps %s", role, address, list(ids))
+        return None
+
+    logger.info("Pushed role=%s for %s to %s tx=%s", role, address, list(ids), tx_ids[0])
+    return tx_ids[0]
+
+
+async def push_roles_on_chain(
+    assignments: list[tuple[str, str]],
+) -> AsyncIterator[tuple[list[int], str | None]]:
+    """Push many (address, role) assignments packed into 16-txn groups.
+
+    Groups are filled with whole assignments (one call per deployed app), so
+    each address is still updated atomically across every contract.  All
+    groups are submitted back-to-back and confirmations are awaited afterwards,
+    so the whole batch costs roughly one confirmation.  Yields
+    ``(assignment indices in the group, tx_id or None on failure)`` as each
+    group settles.  Student rows are skipped.
+    """
+    try:
+        ids = get_app_ids()
+    except FileNotFoundError:
+        logger.warning("App manifest not found — skipping on-chain role push")
+        return
+
+    pending = [i for i, (_, role) in enumerate(assignments) if role in _ROLE_METHODS]
+    if not pending or not ids:
+        return
+
+    algod = get_algod()
+    per_group = max(1, AtomicTransactionComposer.MAX_GROUP_SIZE // len(ids))
+    groups = [pending[start:start + per_group] for start in range(0, len(pending), per_group)]
+    try:
+        acct = await get_dev_account()
+        sp = await get_suggested_params()
+    except Exception:
+        logger.exception("Cannot sign role groups — %d addresses not pushed", len(pending))
+        for indices in groups:
+            yield indices, None
+        return
+
+    submitted: list[tuple[list[int], str | None]] = []
+    for indices in groups:
         try:
-            _, tx_id = _atc_call(app_id, method, [address, True])
-            last_tx = tx_id
-            logger.info("Pushed role=%s for %s to %s (app %d) tx=%s", role, address, name, app_id, tx_id)
+            atc = AtomicTransactionComposer()
+            for idx in indices:
+                address, role = assignments[idx]
+                for app_id in ids.values():
+                    _add_role_call(atc, acct, sp, app_id, address, role)
+            tx_ids = await run_algod(atc.submit, algod)
+            submitted.append((indices, tx_ids[0]))
         except Exception:
-            logger.exception("Failed to push role to %s (app %d)", name, app_id)
-
-    return last_tx
+            logger.exception("Failed to submit role group for %d addresses", len(indices))
+            submitted.append((indices, None))
+
+    for indices, tx_id in submitted:
+        if tx_id is not None:
+            try:
+                await run_algod_wait(transaction.wait_for_confirmation, algod, tx_id, 4)
+            except Exception:
+                logger.exception("Role group %s did not confirm", tx_id)
+                tx_id = None
+        yield indices, tx_id
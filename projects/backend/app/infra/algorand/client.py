@@ -37,7 +37,11 @@ def get_kmd(settings: Settings | None = None) -> kmd.KMDClient:
 # ── KMD dev account helper ───────────────────────────────
 
 def get_localnet_default_account() -> tuple[str, str]:
-    """Return (address, private_key) of the default-funded LocalNet account via KMD."""
+    """Return (address, private_key) of the default-funded LocalNet account via KMD.
+
+    Four KMD round trips — callers should go through ``signer.get_dev_account()``
+    which caches the result.
+    """
     kmd_client = get_kmd()
     wallets = kmd_client.list_wallets()
     default_wallet_id: Optional[str] = None
@@ -49,11 +53,14 @@ def get_localnet_default_account() -> tuple[str, str]:
         raise RuntimeError("LocalNet default wallet not found – is localnet running?")
 
     handle = kmd_client.init_wallet_handle(default_wallet_id, "")
-    keys = kmd_client.list_keys(handle)
-    if not keys:
-        raise RuntimeError("No keys in default wallet")
-    address = keys[0]
-    private_key = kmd_client.export_key(handle, "", address)
+    try:
+        keys = kmd_client.list_keys(handle)
+        if not keys:
+            raise RuntimeError("No keys in default wallet")
+        address = keys[0]
+        private_key = kmd_client.export_key(handle, "", address)
+    finally:
+        kmd_client.release_wallet_handle(handle)
     return address, private_key
 
 
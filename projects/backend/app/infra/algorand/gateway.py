@@ -0,0 +1,153 @@
+"""Async gateway that runs blocking algosdk calls off the event loop.
+
+The algosdk v2 clients (algod / indexer / KMD) are synchronous, and calls such
+as ``atc.execute(..., wait_rounds=4)`` block for several block times.  Every
+SDK call made from an ``async def`` handler goes through this gateway, which
+runs it on a bounded thread pool and caps the number of in-flight calls per
+upstream so a slow write cannot starve list/verify traffic.
+
+Calls that block for block times rather than one round trip go through
+``run_algod_wait``: ``atc.execute`` with wait rounds, ``wait_for_confirmation``
+and the round watcher's ``status_after_block`` long-poll.  They run under their
+own cap and on their own threads, so however many of them are in flight,
+short algod reads (boxes, pending info, params) keep their full share.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ALGOD = "algod"
+ALGOD_WAIT = "algod_wait"  # long waits on algod (confirmations, long-polls)
+INDEXER = "indexer"
+KMD = "kmd"
+
+
+class ChainGateway:
+    """Bounded executor + per-upstream semaphores for blocking SDK calls.
+
+    Upstreams listed in ``dedicated`` get a private thread pool sized to their
+    cap, so their calls never hold threads the other upstreams need.
+
+    A cancelled or timed-out caller stops waiting immediately, but the
+    upstream slot stays taken until the worker thread actually returns, so the
+    concurrency caps hold even when clients disconnect.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        limits: dict[str, int],
+        timeout: Optional[float] = None,
+        dedicated: frozenset[str] = frozenset(),
+    ):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chain")
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=limits.get(name, 1), thread_name_prefix=f"chain-{name}")
+            for name in dedicated
+        }
+        self._limits = limits
+        self._timeout = timeout
+        self._sems: dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, upstream: str) -> asyncio.Semaphore:
+        sem = self._sems.get(upstream)
+        if sem is None:
+            sem = asyncio.Semaphore(self._limits.get(upstream, 1))
+            self._sems[upstream] = sem
+        return sem
+
+    async def run(
+        self,
+        upstream: str,
+        fn: Callable[..., T],
+        /,
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool under the ``upstream`` cap."""
+        sem = self._semaphore(upstream)
+        await sem.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            pool = self._pools.get(upstream, self._pool)
+            fut = loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            sem.release()
+            raise
+
+        def _done(f: asyncio.Future) -> None:
+            sem.release()
+            # Retrieve the exception so abandoned calls don't log "never retrieved".
+            if not f.cancelled():
+                f.exception()
+
+        fut.add_done_callback(_done)
+        limit = self._timeout if timeout is None else timeout
+        return await asyncio.wait_for(asyncio.shield(fut), limit)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """In-flight / capacity per upstream (for health/debug output)."""
+        out: dict[str, dict[str, int]] = {}
+        for name, cap in self._limits.items():
+            sem = self._sems.get(name)
+            free = sem._value if sem is not None else cap  # noqa: SLF001
+            out[name] = {"in_flight": cap - free, "limit": cap}
+        return out
+
+    def shutdown(self) -> None:
+        for pool in (self._pool, *self._pools.values()):
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_gateway() -> ChainGateway:
+    s = get_settings()
+    return ChainGateway(
+        max_workers=s.chain_max_workers,
+        limits={
+            ALGOD: s.algod_max_concurrency,
+            ALGOD_WAIT: s.algod_wait_max_concurrency,
+            INDEXER: s.indexer_max_concurrency,
+            KMD: s.kmd_max_concurrency,
+        },
+        timeout=s.chain_call_timeout,
+        dedicated=frozenset({ALGOD_WAIT}),
+    )
+
+
+def shutdown_gateway() -> None:
+    if get_gateway.cache_info().currsize:
+        get_gateway().shutdown()
+        get_gateway.cache_clear()
+
+
+# ── Convenience wrappers ─────────────────────────────────
+
+async def run_algod(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await get_gateway().run(ALGOD, fn, *args, **kwargs)
+
+
+async def run_algod_wait(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Like ``run_algod`` for calls that wait on rounds (confirmations, long-polls)."""
+    return await get_gateway().run(ALGOD_WAIT, fn, *args, **kwargs)
+
+
+async def run_indexer(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await get_gateway().run(INDEXER, fn, *args, **kwargs)
+
+
+async def run_kmd(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await get_gateway().run(KMD, fn, *args, **kwargs)
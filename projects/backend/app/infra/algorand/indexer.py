@@ -2,14 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import logging
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Optional
 
-from algosdk.v2client.indexer import IndexerClient
-
-from app.infra.algorand.client import get_indexer, get_app_ids
+from app.infra.algorand.client import get_indexer
+from app.infra.algorand.gateway import run_indexer
 
 logger = logging.getLogger(__name__)
 
@@ -42,20 +42,69 @@ def lookup_tx(tx_id: str) -> Optional[dict[str, Any]]:
         return None
 
 
-# ── App-call transaction listing ─────────────────────────
-
-def _search_app_txns(app_id: int, limit: int = 500) -> list[dict]:
-    """Fetch application call transactions for a given app ID."""
-    idx = get_indexer()
-    try:
-        resp = idx.search_transactions(application_id=app_id, limit=limit)
-        return resp.get("transactions", [])
-    except Exception:
-        logger.debug("Indexer search failed for app %d", app_id, exc_info=True)
-        return []
-
-
-def _count_by_selector(txns: list[dict]) -> dict[str, int]:
+# ── Streaming search (follows next tokens) ───────────────
+
+_PAGE_LIMIT = 1000  # indexer max page size
+
+
+async def iter_search_pages(
+    search: Callable[..., dict],
+    result_key: str,
+    *,
+    next_token: Optional[str] = None,
+    limit: int = _PAGE_LIMIT,
+    **params: Any,
+) -> AsyncIterator[tuple[list[dict], Optional[str]]]:
+    """Stream any Indexer search endpoint page by page, following ``next-token``.
+
+    Yields ``(items, next_token)`` where ``next_token`` resumes right after the
+    page, so callers can persist it as a cursor.  The next page is prefetched
+    while the caller processes the current one; only one page is held in
+    memory at a time.  Stops on an empty page or when no token is returned.
+
+    Example::
+
+        async for txns, tok in iter_search_pages(
+            get_indexer().search_transactions, "transactions", application_id=app_id
+        ):
+            ...
+    """
+
+    async def _fetch(token: Optional[str]) -> tuple[list[dict], Optional[str]]:
+        resp = await run_indexer(search, limit=limit, next_page=token, **params)
+        return resp.get(result_key, []), resp.get("next-token")
+
+    items, token = await _fetch(next_token)
+    while items:
+        prefetch = asyncio.create_task(_fetch(token)) if token else None
+        try:
+            yield items, token
+        except BaseException:
+            if prefetch is not None:
+                prefetch.cancel()
+            raise
+        if prefetch is None:
+            return
+        items, token = await prefetch
+
+
+def iter_app_txns(
+    app_id: int,
+    *,
+    next_token: Optional[str] = None,
+    min_round: Optional[int] = None,
+) -> AsyncIterator[tuple[list[dict], Optional[str]]]:
+    """Stream every application call transaction for ``app_id``."""
+    return iter_search_pages(
+        get_indexer().search_transactions,
+        "transactions",
+        next_token=next_token,
+        application_id=app_id,
+        min_round=min_round,
+    )
+
+
+def count_by_selector(txns: list[dict]) -> dict[str, int]:
     """Group app-call transactions by their ABI method selector (base64)."""
     counts: dict[str, int] = {}
     for tx in txns:
@@ -68,47 +117,19 @@ def _count_by_selector(txns: list[dict]) -> dict[str, int]:
 
 # ── Analytics (selector-aware) ───────────────────────────
 
-def get_analytics_summary() -> dict[str, int]:
-    """Build an analytics summary from Indexer data using ABI selectors."""
-    try:
-        ids = get_app_ids()
-    except FileNotFoundError:
-        return {
-            "total_polls": 0,
-            "total_votes": 0,
-            "total_sessions": 0,
-            "total_checkins": 0,
-            "total_certs": 0,
-        }
-
-    voting_id = ids.get("VotingContract", 0)
-    attendance_id = ids.get("AttendanceContract", 0)
-    cert_id = ids.get("CertificateRegistryContract", 0)
-
-    # ── Voting ──────────
-    v_counts: dict[str, int] = {}
-    if voting_id:
-        v_counts = _count_by_selector(_search_app_txns(voting_id))
-    total_polls = v_counts.get(_SEL_CREATE_POLL, 0)
-    total_votes = v_counts.get(_SEL_CAST_VOTE, 0) + v_counts.get(_SEL_CAST_VOTE_DEP, 0)
-
-    # ── Attendance ──────
-    a_counts: dict[str, int] = {}
-    if attendance_id:
-        a_counts = _count_by_selector(_search_app_txns(attendance_id))
-    total_sessions = a_counts.get(_SEL_CREATE_SESSION, 0)
-    total_checkins = a_counts.get(_SEL_CHECK_IN, 0)
-
-    # ── Certificates ────
-    c_counts: dict[str, int] = {}
-    if cert_id:
-        c_counts = _count_by_selector(_search_app_txns(cert_id))
-    total_certs = c_counts.get(_SEL_REGISTER_CERT, 0) + c_counts.get(_SEL_MINT_REG, 0)
+def summarize(counts: dict[str, dict[str, int]]) -> dict[str, int]:
+    """Build the analytics summary from per-contract selector counters.
 
+    ``counts`` maps contract name (as in the app manifest) to
+    ``{selector: count}``.
+    """
+    v_counts = counts.get("VotingContract", {})
+    a_counts = counts.get("AttendanceContract", {})
+    c_counts = counts.get("CertificateRegistryContract", {})
     return {
-        "total_polls": total_polls,
-        "total_votes": total_votes,
-        "total_sessions": total_sessions,
-        "total_checkins": total_checkins,
-        "total_certs": total_certs,
+        "total_polls": v_counts.get(_SEL_CREATE_POLL, 0),
+        "total_votes": v_counts.get(_SEL_CAST_VOTE, 0) + v_counts.get(_SEL_CAST_VOTE_DEP, 0),
+        "total_sessions": a_counts.get(_SEL_CREATE_SESSION, 0),
+        "total_checkins": a_counts.get(_SEL_CHECK_IN, 0),
+        "total_certs": c_counts.get(_SEL_REGISTER_CERT, 0) + c_counts.get(_SEL_MINT_REG, 0),
     }
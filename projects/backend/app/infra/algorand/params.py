@@ -0,0 +1,99 @@
+"""Shared SuggestedParams cache for every BFF-signed transaction.
+
+Suggested params only change meaningfully when a new block arrives (first/last
+valid round) and they stay usable for the whole 1000-round validity window, so
+one algod round trip per block is enough for all writers.  The cache refreshes
+in the background whenever the round watcher sees a new block, and falls back
+to a time-based validity window when the watcher is not running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from functools import lru_cache
+from typing import Optional
+
+from algosdk.transaction import SuggestedParams
+
+from app.config import get_settings
+from app.infra.algorand.client import get_algod
+from app.infra.algorand.gateway import run_algod
+from app.infra.algorand.rounds import get_round_watcher
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestedParamsCache:
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._sp: Optional[SuggestedParams] = None
+        self._round = 0
+        self._fetched = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _fresh(self) -> bool:
+        return self._sp is not None and time.monotonic() - self._fetched < self._ttl
+
+    async def get(self) -> SuggestedParams:
+        """Return a private copy of the cached params (callers may tweak fees)."""
+        if self._fresh():
+            self.hits += 1
+            return copy.copy(self._sp)
+        self.misses += 1
+        return copy.copy(await self._fetch(force=False))
+
+    async def _fetch(self, *, force: bool) -> SuggestedParams:
+        async with self._lock:
+            # Coalesce: a concurrent caller may have refreshed while we waited.
+            if not force and self._fresh():
+                return self._sp
+            sp = await run_algod(get_algod().suggested_params)
+            self._sp = sp
+            self._round = sp.first
+            self._fetched = time.monotonic()
+            self.refreshes += 1
+            return sp
+
+    def on_new_round(self, rnd: int) -> None:
+        """Round-watcher listener: refresh in the background on every new block."""
+        if rnd <= self._round:
+            return
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self._fetch(force=True)
+        except Exception:
+            logger.debug("suggested params refresh failed", exc_info=True)
+
+    def invalidate(self) -> None:
+        self._sp = None
+
+    def stats(self) -> dict[str, float | int]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "round": self._round,
+        }
+
+
+@lru_cache
+def get_params_cache() -> SuggestedParamsCache:
+    cache = SuggestedParamsCache(ttl=get_settings().suggested_params_ttl)
+    get_round_watcher().subscribe(cache.on_new_round)
+    return cache
+
+
+async def get_suggested_params() -> SuggestedParams:
+    return await get_params_cache().get()
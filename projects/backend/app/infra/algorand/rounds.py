@@ -0,0 +1,98 @@
+"""Background block follower shared by everything that cares about new rounds.
+
+One task long-polls algod ``status_after_block`` and publishes the latest
+round.  Consumers either register a cheap synchronous listener (called with
+the new round number) or ``await wait_after(round)``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Callable, Optional
+
+from app.infra.algorand.client import get_algod
+from app.infra.algorand.gateway import run_algod, run_algod_wait
+
+logger = logging.getLogger(__name__)
+
+# algod's wait-for-block endpoint returns after ~1 min even without a new block
+_WAIT_TIMEOUT = 90.0
+_MAX_BACKOFF = 10.0
+
+
+class RoundWatcher:
+    def __init__(self) -> None:
+        self.latest = 0
+        self._listeners: list[Callable[[int], None]] = []
+        self._new_block = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ── Consumer API ─────────────────────────────────────
+
+    def subscribe(self, listener: Callable[[int], None]) -> None:
+        """Call ``listener(round)`` every time a new round is observed."""
+        self._listeners.append(listener)
+
+    async def wait_after(self, rnd: int) -> int:
+        """Block until a round greater than ``rnd`` has been observed."""
+        while self.latest <= rnd:
+            await self._new_block.wait()
+        return self.latest
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ────────────────────────────────────────
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="round-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _advance(self, rnd: int) -> None:
+        self.latest = rnd
+        ev, self._new_block = self._new_block, asyncio.Event()
+        ev.set()
+        for listener in self._listeners:
+            try:
+                listener(rnd)
+            except Exception:
+                logger.exception("round listener failed")
+
+    async def _run(self) -> None:
+        algod = get_algod()
+        backoff = 1.0
+        while True:
+            try:
+                if self.latest == 0:
+                    status = await run_algod(algod.status)
+                else:
+                    status = await run_algod_wait(
+                        algod.status_after_block, self.latest, timeout=_WAIT_TIMEOUT
+                    )
+                rnd = int(status["last-round"])
+                if rnd > self.latest:
+                    self._advance(rnd)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.debug("round watcher: algod status failed", exc_info=True)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, _MAX_BACKOFF)
+
+
+@lru_cache
+def get_round_watcher() -> RoundWatcher:
+    return RoundWatcher()
@@ -0,0 +1,101 @@
+"""Cached signer for the LocalNet dev account.
+
+Resolving the dev account through KMD costs four round trips
+(``list_wallets`` → ``init_wallet_handle`` → ``list_keys`` → ``export_key``).
+The account never changes while LocalNet is up, so it is resolved once and
+cached together with its ``AccountTransactionSigner``.
+
+If ``SIGNER_KEYSTORE_PATH`` points at a local key file, KMD is not contacted at
+all.  The file holds either a 25-word mnemonic (plain text) or JSON with a
+``mnemonic`` or ``private_key`` field.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from algosdk import account, mnemonic
+from algosdk.atomic_transaction_composer import AccountTransactionSigner
+
+from app.config import get_settings
+from app.infra.algorand.client import get_localnet_default_account
+from app.infra.algorand.gateway import run_kmd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DevAccount:
+    address: str
+    private_key: str = field(repr=False)
+    signer: AccountTransactionSigner
+
+
+def _load_keystore(path: Path) -> tuple[str, str]:
+    """Return (address, private_key) from a local keystore file."""
+    text = path.read_text().strip()
+    if text.startswith("{"):
+        data = json.loads(text)
+        if "private_key" in data:
+            sk = data["private_key"]
+        elif "mnemonic" in data:
+            sk = mnemonic.to_private_key(data["mnemonic"])
+        else:
+            raise ValueError(f"keystore {path} has neither 'mnemonic' nor 'private_key'")
+    else:
+        sk = mnemonic.to_private_key(text)
+    return account.address_from_private_key(sk), sk
+
+
+class SignerProvider:
+    """Resolve the dev account once and hand out the cached signer."""
+
+    def __init__(self, keystore_path: Optional[str] = None):
+        self._keystore = Path(keystore_path) if keystore_path else None
+        self._account: Optional[DevAccount] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> DevAccount:
+        acct = self._account
+        if acct is not None:
+            return acct
+        async with self._lock:
+            if self._account is None:
+                self._account = await self._resolve()
+            return self._account
+
+    def invalidate(self) -> None:
+        """Drop the cached account; the next ``get()`` resolves it again."""
+        self._account = None
+
+    async def refresh(self) -> DevAccount:
+        self.invalidate()
+        return await self.get()
+
+    async def _resolve(self) -> DevAccount:
+        if self._keystore is not None:
+            address, sk = _load_keystore(self._keystore)
+            logger.info("Loaded dev signer %s from keystore %s", address, self._keystore)
+        else:
+            address, sk = await run_kmd(get_localnet_default_account)
+            logger.info("Resolved dev signer %s via KMD", address)
+        return DevAccount(address=address, private_key=sk, signer=AccountTransactionSigner(sk))
+
+
+@lru_cache
+def get_signer_provider() -> SignerProvider:
+    return SignerProvider(get_settings().signer_keystore_path or None)
+
+
+async def get_dev_account() -> DevAccount:
+    return await get_signer_provider().get()
+
+
+def invalidate_dev_account() -> None:
+    get_signer_provider().invalidate()
@@ -0,0 +1,157 @@
+"""In-process caches shared by the use-case layer."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class RoundCache(Generic[K, V]):
+    """Keyed cache invalidated by the latest confirmed round.
+
+    * Fresh entry (computed at the current round) → returned directly.
+    * Stale entry (older round, or older than ``max_age``) → returned
+      immediately while one background recomputation runs
+      (stale-while-revalidate).
+    * Missing entry → callers wait on a single shared computation.
+
+    Concurrent callers for the same key share one in-flight computation, so
+    N pollers cause at most one recomputation per new block.
+    """
+
+    def __init__(
+        self,
+        round_fn: Callable[[], int],
+        *,
+        max_entries: int = 1024,
+        max_age: Optional[float] = None,
+    ):
+        self._round_fn = round_fn
+        self._max_entries = max_entries
+        self._max_age = max_age
+        self._entries: OrderedDict[K, tuple[int, float, V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Task] = {}
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+        self.computes = 0
+
+    async def get(self, key: K, compute: Callable[[], Awaitable[V]]) -> V:
+        rnd = self._round_fn()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            e_round, e_time, value = entry
+            expired = self._max_age is not None and time.monotonic() - e_time > self._max_age
+            if e_round >= rnd and not expired:
+                self.hits += 1
+                return value
+            self.stale += 1
+            self._refresh(key, compute, rnd)
+            return value
+        self.misses += 1
+        return await asyncio.shield(self._refresh(key, compute, rnd))
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _refresh(self, key: K, compute: Callable[[], Awaitable[V]], rnd: int) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute(key, compute, rnd))
+            task.add_done_callback(self._log_failure)
+            self._inflight[key] = task
+        return task
+
+    async def _compute(self, key: K, compute: Callable[[], Awaitable[V]], rnd: int) -> V:
+        try:
+            value = await compute()
+            self.computes += 1
+            self._entries[key] = (rnd, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("cache recomputation failed", exc_info=task.exception())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale": self.stale,
+            "misses": self.misses,
+            "computes": self.computes,
+        }
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU with a per-entry time-to-live, for values owned by SQLite.
+
+    ``get`` loads misses through the supplied coroutine.  Writers call
+    ``invalidate`` after committing; a load that started before the
+    invalidation is not stored, so a concurrent read cannot put back the value
+    that was just replaced.
+    """
+
+    def __init__(self, *, max_entries: int = 10_000, ttl: float = 60.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if time.monotonic() < expires:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        epoch = self._epoch
+        value = await load()
+        if epoch == self._epoch:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, keys: Optional[Iterable[K]] = None) -> None:
+        """Drop ``keys`` (or everything) and discard loads already in flight."""
+        self._epoch += 1
+        self.invalidations += 1
+        if keys is None:
+            self._entries.clear()
+        else:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
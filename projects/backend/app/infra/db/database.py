@@ -1,76 +1,271 @@
-"""Async SQLite database helpers (aiosqlite)."""
+"""Async SQLite database helpers (aiosqlite).
+
+The database runs in WAL mode: one writer connection applies every write
+through a group-commit queue, while a pool of read-only connections serves
+reads concurrently (WAL readers never block on the writer).
+"""
 
 from __future__ import annotations
 
+import asyncio
 import aiosqlite
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from pathlib import Path
-from typing import Optional
-
-_db: Optional[aiosqlite.Connection] = None
-
-_SCHEMA = """
-CREATE TABLE IF NOT EXISTS roles (
-    address  TEXT PRIMARY KEY,
-    role     TEXT NOT NULL DEFAULT 'student'
-);
-
-CREATE TABLE IF NOT EXISTS nonces (
-    address  TEXT PRIMARY KEY,
-    nonce    TEXT NOT NULL,
-    created  REAL NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS tx_tracking (
-    tx_id           TEXT PRIMARY KEY,
-    kind            TEXT NOT NULL,
-    status          TEXT NOT NULL DEFAULT 'pending',
-    confirmed_round INTEGER
-);
-
-CREATE TABLE IF NOT EXISTS cert_metadata (
-    cert_hash   TEXT PRIMARY KEY,
-    recipient   TEXT NOT NULL,
-    asset_id    INTEGER,
-    metadata    TEXT NOT NULL,
-    created     REAL NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS polls (
-    poll_id         INTEGER PRIMARY KEY,
-    question        TEXT NOT NULL,
-    options_json    TEXT NOT NULL,
-    start_round     INTEGER NOT NULL,
-    end_round       INTEGER NOT NULL,
-    creator         TEXT NOT NULL,
-    app_id          INTEGER NOT NULL,
-    tx_id           TEXT,
-    created         REAL NOT NULL
-);
-
-CREATE TABLE IF NOT EXISTS sessions (
-    session_id      INTEGER PRIMARY KEY,
-    course_code     TEXT NOT NULL,
-    session_ts      INTEGER NOT NULL,
-    open_round      INTEGER NOT NULL,
-    close_round     INTEGER NOT NULL,
-    creator         TEXT NOT NULL,
-    app_id          INTEGER NOT NULL,
-    tx_id           TEXT,
-    created         REAL NOT NULL
-);
-"""
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from app.config import Settings, get_settings
+from app.infra.db.migrations import apply_migrations
+
+T = TypeVar("T")
+
+
+class _WriteOp:
+    __slots__ = ("fn", "future")
+
+    def __init__(self, fn: Callable[[aiosqlite.Connection], Awaitable[Any]], future: asyncio.Future):
+        self.fn = fn
+        self.future = future
+
+
+class Database:
+    """Single group-commit writer + pool of read-only connections.
+
+    Writes are queued and a single writer task applies them in batches: it
+    collects operations for up to ``commit_window`` seconds (or
+    ``commit_batch_size`` ops), runs each inside its own SAVEPOINT so one
+    failing write doesn't sink the others, then commits the whole batch with
+    one fsync.  Each caller's future resolves only after that commit, so a
+    returned write is durable.  ``commit_window=0`` adds no latency and only
+    batches writes that are already queued.  ``close`` stops accepting writes
+    and lets the writer commit everything queued before it.
+    """
+
+    def __init__(
+        self,
+        writer: aiosqlite.Connection,
+        readers: list[aiosqlite.Connection],
+        *,
+        commit_window: float = 0.0,
+        commit_batch_size: int = 256,
+    ):
+        self.writer = writer
+        self._readers = readers
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for conn in readers:
+            self._idle.put_nowait(conn)
+        self._window = commit_window
+        self._batch_size = max(1, commit_batch_size)
+        self._queue: asyncio.Queue[Optional[_WriteOp]] = asyncio.Queue()  # None = stop
+        self._closing = False
+        self._writer_task = asyncio.create_task(self._write_loop(), name="db-writer")
+        self.reads = 0
+        self.read_waits = 0
+        self.writes = 0
+        self.write_errors = 0
+        self.commits = 0
+        self.max_batch = 0
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        if self._idle.empty():
+            self.read_waits += 1
+        conn = await self._idle.get()
+        self.reads += 1
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    async def run_write(self, fn: Callable[[aiosqlite.Connection], Awaitable[T]]) -> T:
+        """Queue ``fn(writer)`` and wait until the batch containing it is committed."""
+        if self._closing or self._writer_task.done():
+            raise RuntimeError("DB writer is not running")
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_WriteOp(fn, fut))
+        return await fut
+
+    async def _next_batch(self) -> tuple[list[_WriteOp], bool]:
+        """(ops to commit together, whether the stop sentinel was reached)."""
+        op = await self._queue.get()
+        if op is None:
+            return [], True
+        batch = [op]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._window
+        while len(batch) < self._batch_size:
+            if not self._queue.empty():
+                op = self._queue.get_nowait()
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    op = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if op is None:
+                return batch, True
+            batch.append(op)
+        return batch, False
+
+    async def _write_loop(self) -> None:
+        while True:
+            batch, stop = await self._next_batch()
+            if batch:
+                await self._apply(batch)
+            if stop:
+                return
+
+    async def _apply(self, batch: list[_WriteOp]) -> None:
+        db = self.writer
+        done: list[tuple[_WriteOp, Any]] = []
+        try:
+            await db.execute("BEGIN")
+            for op in batch:
+                await db.execute("SAVEPOINT op")
+                try:
+                    result = await op.fn(db)
+                except Exception as exc:
+                    await db.execute("ROLLBACK TO op")
+                    await db.execute("RELEASE op")
+                    self.write_errors += 1
+                    if not op.future.done():
+                        op.future.set_exception(exc)
+                    continue
+                await db.execute("RELEASE op")
+                done.append((op, result))
+            await db.commit()
+        except Exception as exc:
+            # Commit (or BEGIN) itself failed: nothing in this batch is durable.
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+            for op in batch:
+                if not op.future.done():
+                    op.future.set_exception(exc)
+            self.write_errors += len(done)
+            return
+        self.commits += 1
+        self.writes += len(done)
+        self.max_batch = max(self.max_batch, len(batch))
+        for op, result in done:
+            if not op.future.done():
+                op.future.set_result(result)
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "readers": len(self._readers),
+            "readers_idle": self._idle.qsize(),
+            "reads": self.reads,
+            "read_waits": self.read_waits,
+            "writes": self.writes,
+            "write_errors": self.write_errors,
+            "write_queue": self._queue.qsize(),
+            "commits": self.commits,
+            "avg_batch": round(self.writes / self.commits, 2) if self.commits else 0.0,
+            "max_batch": self.max_batch,
+        }
+
+    async def close(self) -> None:
+        # Refuse new writes; the writer commits everything queued before the
+        # sentinel (including a batch it is applying right now), then exits.
+        self._closing = True
+        self._queue.put_nowait(None)
+        await asyncio.gather(self._writer_task, return_exceptions=True)
+        while not self._queue.empty():  # only if the writer died early
+            op = self._queue.get_nowait()
+            if op is not None and not op.future.done():
+                op.future.set_exception(RuntimeError("DB closed before the write was applied"))
+        for conn in self._readers:
+            await conn.close()
+        await self.writer.close()
+
+_db: Optional[Database] = None
+
+
+async def _connect(path: Path, settings: Settings, *, readonly: bool) -> aiosqlite.Connection:
+    if readonly:
+        conn = await aiosqlite.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    else:
+        conn = await aiosqlite.connect(str(path))
+    conn.row_factory = aiosqlite.Row
+    await conn.execute(f"PRAGMA busy_timeout = {int(settings.db_busy_timeout_ms)}")
+    await conn.execute(f"PRAGMA cache_size = {-int(settings.db_cache_size_kib)}")
+    await conn.execute(f"PRAGMA mmap_size = {int(settings.db_mmap_size)}")
+    if readonly:
+        await conn.execute("PRAGMA query_only = ON")
+    else:
+        await conn.execute("PRAGMA journal_mode = WAL")
+        await conn.execute(f"PRAGMA synchronous = {settings.db_synchronous}")
+    return conn
 
 
-async def init_db(path: Path) -> None:
+async def init_db(path: Path, settings: Settings | None = None) -> None:
     global _db
+    s = settings or get_settings()
     path.parent.mkdir(parents=True, exist_ok=True)
-    _db = await aiosqlite.connect(str(path))
-    _db.row_factory = aiosqlite.Row
-    await _db.executescript(_SCHEMA)
-    await _db.commit()
+    writer = await _connect(path, s, readonly=False)
+    await apply_migrations(writer)
+    readers = [await _connect(path, s, readonly=True) for _ in range(max(1, s.db_read_pool_size))]
+    _db = Database(
+        writer,
+        readers,
+        commit_window=s.db_commit_window_ms / 1000,
+        commit_batch_size=s.db_commit_batch_size,
+    )
 
 
-async def get_db() -> aiosqlite.Connection:
+async def close_db() -> None:
+    global _db
+    if _db is not None:
+        await _db.close()
+        _db = None
+
+
+def _require() -> Database:
     if _db is None:
         raise RuntimeError("DB not initialised – call init_db first")
     return _db
+
+
+async def get_db() -> aiosqlite.Connection:
+    """The raw writer connection — only for setup before requests are served.
+
+    Runtime writes must go through ``run_write`` / ``write_execute`` so they
+    join the group-commit queue.
+    """
+    return _require().writer
+
+
+def read_db() -> AbstractAsyncContextManager[aiosqlite.Connection]:
+    """``async with read_db() as db:`` – borrow a pooled read-only connection."""
+    return _require().read()
+
+
+async def run_write(fn: Callable[[aiosqlite.Connection], Awaitable[T]]) -> T:
+    """Run ``fn(writer)`` in the next group commit; returns once it is durable."""
+    return await _require().run_write(fn)
+
+
+async def write_execute(sql: str, params: Sequence[Any] = ()) -> int:
+    """Queue one statement; returns its rowcount once committed."""
+
+    async def _op(db: aiosqlite.Connection) -> int:
+        cur = await db.execute(sql, params)
+        return cur.rowcount
+
+    return await run_write(_op)
+
+
+async def write_executemany(sql: str, rows: Sequence[Sequence[Any]]) -> None:
+    """Queue one executemany; returns once committed."""
+
+    async def _op(db: aiosqlite.Connection) -> None:
+        await db.executemany(sql, rows)
+
+    await run_write(_op)
+
+
+def pool_stats() -> dict[str, float | int]:
+    return _db.stats() if _db is not None else {}
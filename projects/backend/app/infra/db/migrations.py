@@ -0,0 +1,165 @@
+"""Versioned schema migrations for the BFF SQLite database.
+
+The applied version is stored in ``PRAGMA user_version``.  ``apply_migrations``
+runs every migration newer than that, in order, each in its own transaction.
+Append new migrations to ``MIGRATIONS``; never edit one that has shipped.
+Databases created before versioning report version 0; the early migrations use
+``IF NOT EXISTS`` so they apply cleanly on top of them.
+
+``explain_full_scans`` runs ``EXPLAIN QUERY PLAN`` over a list of queries and
+reports the ones that scan a whole table or sort without an index.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Sequence
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+_V1_INITIAL = """
+CREATE TABLE IF NOT EXISTS roles (
+    address  TEXT PRIMARY KEY,
+    role     TEXT NOT NULL DEFAULT 'student'
+);
+
+CREATE TABLE IF NOT EXISTS nonces (
+    address  TEXT PRIMARY KEY,
+    nonce    TEXT NOT NULL,
+    created  REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tx_tracking (
+    tx_id           TEXT PRIMARY KEY,
+    kind            TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'pending',
+    confirmed_round INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS cert_metadata (
+    cert_hash   TEXT PRIMARY KEY,
+    recipient   TEXT NOT NULL,
+    asset_id    INTEGER,
+    metadata    TEXT NOT NULL,
+    created     REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS polls (
+    poll_id         INTEGER PRIMARY KEY,
+    question        TEXT NOT NULL,
+    options_json    TEXT NOT NULL,
+    start_round     INTEGER NOT NULL,
+    end_round       INTEGER NOT NULL,
+    creator         TEXT NOT NULL,
+    app_id          INTEGER NOT NULL,
+    tx_id           TEXT,
+    created         REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id      INTEGER PRIMARY KEY,
+    course_code     TEXT NOT NULL,
+    session_ts      INTEGER NOT NULL,
+    open_round      INTEGER NOT NULL,
+    close_round     INTEGER NOT NULL,
+    creator         TEXT NOT NULL,
+    app_id          INTEGER NOT NULL,
+    tx_id           TEXT,
+    created         REAL NOT NULL
+);
+"""
+
+_V2_ANALYTICS = """
+CREATE TABLE IF NOT EXISTS indexer_cursors (
+    app_id          INTEGER PRIMARY KEY,
+    next_token      TEXT,
+    last_round      INTEGER NOT NULL DEFAULT 0,
+    updated         REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS selector_counts (
+    app_id          INTEGER NOT NULL,
+    selector        TEXT NOT NULL,
+    count           INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (app_id, selector)
+);
+"""
+
+_V3_LIST_INDEXES = """
+-- list_certs: ORDER BY created DESC (covering)
+CREATE INDEX IF NOT EXISTS idx_cert_metadata_created
+    ON cert_metadata (created, cert_hash, recipient, asset_id);
+
+-- list_certs_for_recipient: WHERE recipient = ? ORDER BY created DESC (covering)
+CREATE INDEX IF NOT EXISTS idx_cert_metadata_recipient_created
+    ON cert_metadata (recipient, created, cert_hash, asset_id);
+
+-- list_polls / list_sessions: ORDER BY created DESC
+CREATE INDEX IF NOT EXISTS idx_polls_created ON polls (created);
+CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions (created);
+
+-- list_pending_txs: WHERE status = 'pending'
+CREATE INDEX IF NOT EXISTS idx_tx_tracking_status ON tx_tracking (status);
+"""
+
+_V4_KEYSET_INDEXES = """
+-- keyset pagination on (created, id) for polls and sessions
+DROP INDEX IF EXISTS idx_polls_created;
+DROP INDEX IF EXISTS idx_sessions_created;
+CREATE INDEX IF NOT EXISTS idx_polls_created_id ON polls (created, poll_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_created_id ON sessions (created, session_id);
+"""
+
+_V5_NONCE_EXPIRY = """
+-- expired-nonce sweep: WHERE created < ?
+CREATE INDEX IF NOT EXISTS idx_nonces_created ON nonces (created);
+"""
+
+# (version, description, SQL script) — append only
+MIGRATIONS: list[tuple[int, str, str]] = [
+    (1, "initial schema", _V1_INITIAL),
+    (2, "analytics ingestion cursor + selector counters", _V2_ANALYTICS),
+    (3, "indexes for list and pending-tx queries", _V3_LIST_INDEXES),
+    (4, "(created, id) indexes for keyset pagination", _V4_KEYSET_INDEXES),
+    (5, "nonce expiry index", _V5_NONCE_EXPIRY),
+]
+
+
+async def schema_version(db: aiosqlite.Connection) -> int:
+    cur = await db.execute("PRAGMA user_version")
+    row = await cur.fetchone()
+    return int(row[0])
+
+
+async def apply_migrations(db: aiosqlite.Connection) -> int:
+    """Bring the schema up to the latest version; returns the resulting version."""
+    current = await schema_version(db)
+    for version, description, script in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info("Applying DB migration %d: %s", version, description)
+        await db.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {version};\nCOMMIT;")
+        current = version
+    return current
+
+
+# "SCAN <table>" with no "USING ... INDEX" → the whole table is read
+_FULL_SCAN = re.compile(r"^SCAN \S+$")
+
+
+async def explain_full_scans(
+    db: aiosqlite.Connection,
+    queries: Sequence[tuple[str, Sequence[Any]]],
+) -> list[tuple[str, str]]:
+    """Return (sql, plan step) for every full table scan or temp B-tree sort."""
+    problems: list[tuple[str, str]] = []
+    for sql, params in queries:
+        cur = await db.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        for row in await cur.fetchall():
+            detail = row["detail"] if isinstance(row, aiosqlite.Row) else row[3]
+            if _FULL_SCAN.match(detail) or "TEMP B-TREE" in detail:
+                problems.append((sql, detail))
+    return problems
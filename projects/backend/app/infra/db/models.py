@@ -1,124 +1,265 @@
 """Thin query helpers over the SQLite tables.
 
-All write helpers commit immediately.  For reads the row-factory is aiosqlite.Row.
+Reads borrow a connection from the read-only pool.  Writes go through the
+group-commit queue: each helper returns once the transaction containing its
+write has been committed.  The row-factory is aiosqlite.Row.
 """
 
 from __future__ import annotations
 
+import base64
+import json
+import logging
 import time
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional, Sequence
 
 import aiosqlite
 
-from app.infra.db.database import get_db
+from app.config import get_settings
+from app.infra.cache import TTLCache
+from app.infra.db.database import read_db, run_write, write_execute, write_executemany
+from app.infra.db.migrations import explain_full_scans
+
+logger = logging.getLogger(__name__)
+
+
+# ── Keyset pagination ────────────────────────────────────
+#
+# List queries page on (created, id) newest-first.  The cursor handed to
+# clients is the opaque base64url encoding of the last row's (created, id), so
+# every page is an index range seek regardless of depth.
+
+def encode_cursor(created: float, key: int | str) -> str:
+    raw = json.dumps([created, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> tuple[float, int | str]:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` for a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created, key = json.loads(raw)
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(created, (int, float)) or isinstance(key, bool) or not isinstance(key, (int, str)):
+        raise ValueError("invalid cursor")
+    return float(created), key
+
+
+def _keyset_sql(select: str, key: str, *, where: str = "") -> tuple[str, str]:
+    """(first page, next page) statements for ``select`` ordered by (created, key) DESC."""
+    order = f" ORDER BY created DESC, {key} DESC LIMIT ?"
+    first = select + (f" WHERE {where}" if where else "") + order
+    after = select + f" WHERE {where + ' AND ' if where else ''}(created, {key}) < (?, ?)" + order
+    return first, after
+
+
+async def _keyset_page(
+    queries: tuple[str, str],
+    key: str,
+    params: Sequence[Any],
+    limit: int,
+    cursor: Optional[str],
+) -> tuple[list[dict], Optional[str]]:
+    """Fetch one page; returns (rows, cursor for the next page or None)."""
+    first, after = queries
+    if cursor is None:
+        sql, args = first, (*params, limit + 1)
+    else:
+        sql, args = after, (*params, *decode_cursor(cursor), limit + 1)
+    async with read_db() as db:
+        cur = await db.execute(sql, args)
+        rows = [dict(r) for r in await cur.fetchall()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["created"], rows[-1][key])
 
 
 # ── Nonces ───────────────────────────────────────────────
 
 async def upsert_nonce(address: str, nonce: str) -> None:
-    db = await get_db()
-    await db.execute(
+    await write_execute(
         "INSERT INTO nonces (address, nonce, created) VALUES (?, ?, ?) "
         "ON CONFLICT(address) DO UPDATE SET nonce=excluded.nonce, created=excluded.created",
         (address, nonce, time.time()),
     )
-    await db.commit()
 
 
-async def get_nonce(address: str) -> Optional[str]:
-    db = await get_db()
-    cur = await db.execute("SELECT nonce FROM nonces WHERE address = ?", (address,))
-    row = await cur.fetchone()
-    return row["nonce"] if row else None
+async def get_nonce(address: str, not_before: float = 0.0) -> Optional[str]:
+    """Current nonce for ``address`` unless it was issued before ``not_before``."""
+    async with read_db() as db:
+        cur = await db.execute(
+            "SELECT nonce FROM nonces WHERE address = ? AND created >= ?", (address, not_before)
+        )
+        row = await cur.fetchone()
+        return row["nonce"] if row else None
 
 
-async def delete_nonce(address: str) -> None:
-    db = await get_db()
-    await db.execute("DELETE FROM nonces WHERE address = ?", (address,))
-    await db.commit()
+async def consume_nonce(address: str, nonce: str, not_before: float = 0.0) -> bool:
+    """Delete the nonce if it is still current and unexpired; False if someone else used it."""
+    deleted = await write_execute(
+        "DELETE FROM nonces WHERE address = ? AND nonce = ? AND created >= ?",
+        (address, nonce, not_before),
+    )
+    return deleted == 1
+
+
+_EXPIRED_NONCES_SQL = "SELECT rowid FROM nonces WHERE created < ? LIMIT ?"
+
+
+async def delete_expired_nonces(before: float, limit: int) -> int:
+    """Delete up to ``limit`` nonces issued before ``before``; returns how many."""
+    return await write_execute(f"DELETE FROM nonces WHERE rowid IN ({_EXPIRED_NONCES_SQL})", (before, limit))
 
 
 # ── Roles ────────────────────────────────────────────────
 
+@lru_cache
+def get_role_cache() -> TTLCache[str, str]:
+    s = get_settings()
+    return TTLCache(max_entries=s.role_cache_size, ttl=s.role_cache_ttl)
+
+
 async def upsert_role(address: str, role: str) -> None:
-    db = await get_db()
-    await db.execute(
+    await write_execute(
         "INSERT INTO roles (address, role) VALUES (?, ?) "
         "ON CONFLICT(address) DO UPDATE SET role=excluded.role",
         (address, role),
     )
-    await db.commit()
+    get_role_cache().invalidate([address])
+
+
+async def upsert_roles(rows: list[tuple[str, str]]) -> None:
+    """Bulk upsert of (address, role) pairs in a single transaction."""
+    await write_executemany(
+        "INSERT INTO roles (address, role) VALUES (?, ?) "
+        "ON CONFLICT(address) DO UPDATE SET role=excluded.role",
+        rows,
+    )
+    get_role_cache().invalidate(address for address, _ in rows)
 
 
 async def get_role(address: str) -> str:
-    db = await get_db()
-    cur = await db.execute("SELECT role FROM roles WHERE address = ?", (address,))
-    row = await cur.fetchone()
-    return row["role"] if row else "student"
+    """Role for ``address`` (default "student"), served from the role cache."""
+    return await get_role_cache().get(address, lambda: _select_role(address))
+
+
+async def _select_role(address: str) -> str:
+    async with read_db() as db:
+        cur = await db.execute("SELECT role FROM roles WHERE address = ?", (address,))
+        row = await cur.fetchone()
+        return row["role"] if row else "student"
 
 
 # ── TX tracking ──────────────────────────────────────────
 
 async def upsert_tx(tx_id: str, kind: str, status: str = "pending", confirmed_round: Optional[int] = None) -> None:
-    db = await get_db()
-    await db.execute(
+    await write_execute(
         "INSERT INTO tx_tracking (tx_id, kind, status, confirmed_round) VALUES (?, ?, ?, ?) "
         "ON CONFLICT(tx_id) DO UPDATE SET status=excluded.status, confirmed_round=excluded.confirmed_round",
         (tx_id, kind, status, confirmed_round),
     )
-    await db.commit()
 
 
 async def get_tx(tx_id: str) -> Optional[dict]:
-    db = await get_db()
-    cur = await db.execute("SELECT * FROM tx_tracking WHERE tx_id = ?", (tx_id,))
-    row = await cur.fetchone()
-    return dict(row) if row else None
+    async with read_db() as db:
+        cur = await db.execute("SELECT * FROM tx_tracking WHERE tx_id = ?", (tx_id,))
+        row = await cur.fetchone()
+        return dict(row) if row else None
+
+
+_PENDING_TXS_SQL = "SELECT * FROM tx_tracking WHERE status = 'pending'"
 
 
 async def list_pending_txs() -> list[dict]:
-    db = await get_db()
-    cur = await db.execute("SELECT * FROM tx_tracking WHERE status = 'pending'")
-    return [dict(r) for r in await cur.fetchall()]
+    async with read_db() as db:
+        cur = await db.execute(_PENDING_TXS_SQL)
+        return [dict(r) for r in await cur.fetchall()]
 
 
 # ── Certificate metadata ─────────────────────────────────
 
 async def store_cert_metadata(cert_hash: str, recipient: str, asset_id: int, metadata_json: str) -> None:
-    db = await get_db()
-    await db.execute(
+    await write_execute(
         "INSERT INTO cert_metadata (cert_hash, recipient, asset_id, metadata, created) VALUES (?, ?, ?, ?, ?) "
         "ON CONFLICT(cert_hash) DO UPDATE SET metadata=excluded.metadata",
         (cert_hash, recipient, asset_id, metadata_json, time.time()),
     )
-    await db.commit()
 
 
-async def get_cert_metadata(cert_hash: str) -> Optional[str]:
-    db = await get_db()
-    cur = await db.execute("SELECT metadata FROM cert_metadata WHERE cert_hash = ?", (cert_hash,))
-    row = await cur.fetchone()
-    return row["metadata"] if row else None
-
-
-async def list_certs(limit: int = 100, offset: int = 0) -> list[dict]:
-    db = await get_db()
-    cur = await db.execute(
-        "SELECT cert_hash, recipient, asset_id, created FROM cert_metadata "
-        "ORDER BY created DESC LIMIT ? OFFSET ?",
-        (limit, offset),
+async def store_cert_metadata_bulk(rows: list[tuple[str, str, str]]) -> None:
+    """Bulk insert of (cert_hash, recipient, metadata_json) before minting (asset_id unset)."""
+    now = time.time()
+    await write_executemany(
+        "INSERT INTO cert_metadata (cert_hash, recipient, asset_id, metadata, created) VALUES (?, ?, NULL, ?, ?) "
+        "ON CONFLICT(cert_hash) DO UPDATE SET metadata=excluded.metadata",
+        [(h, r, m, now) for h, r, m in rows],
     )
-    return [dict(r) for r in await cur.fetchall()]
 
 
-async def list_certs_for_recipient(recipient: str, limit: int = 100) -> list[dict]:
-    db = await get_db()
-    cur = await db.execute(
-        "SELECT cert_hash, recipient, asset_id, created FROM cert_metadata "
-        "WHERE recipient = ? ORDER BY created DESC LIMIT ?",
-        (recipient, limit),
+async def set_cert_asset_ids(rows: list[tuple[int, str]]) -> None:
+    """Bulk update of (asset_id, cert_hash) once the certificate ASAs are minted."""
+    await write_executemany("UPDATE cert_metadata SET asset_id = ? WHERE cert_hash = ?", rows)
+
+
+async def delete_unminted_cert_metadata(cert_hashes: list[str]) -> None:
+    """Drop rows written by ``store_cert_metadata_bulk`` whose mint failed."""
+    await write_executemany(
+        "DELETE FROM cert_metadata WHERE cert_hash = ? AND asset_id IS NULL",
+        [(h,) for h in cert_hashes],
     )
-    return [dict(r) for r in await cur.fetchall()]
+
+
+async def get_cert_metadata(cert_hash: str) -> Optional[str]:
+    """Metadata JSON of a minted certificate (rows still awaiting their ASA are hidden)."""
+    async with read_db() as db:
+        cur = await db.execute(
+            "SELECT metadata FROM cert_metadata WHERE cert_hash = ? AND asset_id IS NOT NULL", (cert_hash,)
+        )
+        row = await cur.fetchone()
+        return row["metadata"] if row else None
+
+
+@lru_cache
+def get_metadata_cache() -> TTLCache[str, bytes]:
+    # Metadata is derived from the hashed payload, so an entry never goes stale.
+    return TTLCache(max_entries=get_settings().metadata_cache_size, ttl=float("inf"))
+
+
+async def get_cert_metadata_bytes(cert_hash: str) -> Optional[bytes]:
+    """Stored metadata JSON as UTF-8 bytes, served from the metadata LRU."""
+    async def _load() -> bytes:
+        raw = await get_cert_metadata(cert_hash)
+        if raw is None:
+            raise KeyError(cert_hash)  # unknown or not-yet-minted hashes are not cached
+        return raw.encode()
+
+    try:
+        return await get_metadata_cache().get(cert_hash, _load)
+    except KeyError:
+        return None
+
+
+_CERT_COLUMNS = "SELECT cert_hash, recipient, asset_id, created FROM cert_metadata"
+# Only minted certificates are listed; the indexes cover asset_id, so the filter stays index-only.
+_LIST_CERTS_SQL = _keyset_sql(_CERT_COLUMNS, "cert_hash", where="asset_id IS NOT NULL")
+_LIST_RECIPIENT_CERTS_SQL = _keyset_sql(
+    _CERT_COLUMNS, "cert_hash", where="recipient = ? AND asset_id IS NOT NULL"
+)
+
+
+async def list_certs(limit: int = 100, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+    return await _keyset_page(_LIST_CERTS_SQL, "cert_hash", (), limit, cursor)
+
+
+async def list_certs_for_recipient(
+    recipient: str,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    return await _keyset_page(_LIST_RECIPIENT_CERTS_SQL, "cert_hash", (recipient,), limit, cursor)
 
 
 # ── Polls (BFF cache) ───────────────────────────────────
@@ -133,29 +274,25 @@ async def insert_poll(
     app_id: int,
     tx_id: str | None = None,
 ) -> None:
-    db = await get_db()
-    await db.execute(
+    await write_execute(
         "INSERT INTO polls (poll_id, question, options_json, start_round, end_round, creator, app_id, tx_id, created) "
         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
         (poll_id, question, options_json, start_round, end_round, creator, app_id, tx_id, time.time()),
     )
-    await db.commit()
 
 
-async def list_polls(limit: int = 100, offset: int = 0) -> list[dict]:
-    db = await get_db()
-    cur = await db.execute(
-        "SELECT * FROM polls ORDER BY created DESC LIMIT ? OFFSET ?",
-        (limit, offset),
-    )
-    return [dict(r) for r in await cur.fetchall()]
+_LIST_POLLS_SQL = _keyset_sql("SELECT * FROM polls", "poll_id")
+
+
+async def list_polls(limit: int = 100, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+    return await _keyset_page(_LIST_POLLS_SQL, "poll_id", (), limit, cursor)
 
 
 async def get_poll(poll_id: int) -> Optional[dict]:
-    db = await get_db()
-    cur = await db.execute("SELECT * FROM polls WHERE poll_id = ?", (poll_id,))
-    row = await cur.fetchone()
-    return dict(row) if row else None
+    async with read_db() as db:
+        cur = await db.execute("SELECT * FROM polls WHERE poll_id = ?", (poll_id,))
+        row = await cur.fetchone()
+        return dict(row) if row else None
 
 
 # ── Sessions (BFF cache) ────────────────────────────────
@@ -170,26 +307,90 @@ async def insert_session(
     app_id: int,
     tx_id: str | None = None,
 ) -> None:
-    db = await get_db()
-    await db.execute(
+    await write_execute(
         "INSERT INTO sessions (session_id, course_code, session_ts, open_round, close_round, creator, app_id, tx_id, created) "
         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
         (session_id, course_code, session_ts, open_round, close_round, creator, app_id, tx_id, time.time()),
     )
-    await db.commit()
 
 
-async def list_sessions(limit: int = 100, offset: int = 0) -> list[dict]:
-    db = await get_db()
-    cur = await db.execute(
-        "SELECT * FROM sessions ORDER BY created DESC LIMIT ? OFFSET ?",
-        (limit, offset),
-    )
-    return [dict(r) for r in await cur.fetchall()]
+_LIST_SESSIONS_SQL = _keyset_sql("SELECT * FROM sessions", "session_id")
+
+
+async def list_sessions(limit: int = 100, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+    return await _keyset_page(_LIST_SESSIONS_SQL, "session_id", (), limit, cursor)
 
 
 async def get_session(session_id: int) -> Optional[dict]:
-    db = await get_db()
-    cur = await db.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,))
-    row = await cur.fetchone()
-    return dict(row) if row else None
+    async with read_db() as db:
+        cur = await db.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,))
+        row = await cur.fetchone()
+        return dict(row) if row else None
+
+
+# ── Analytics ingestion (indexer cursor + selector counters) ──
+
+async def get_indexer_cursor(app_id: int) -> Optional[dict]:
+    async with read_db() as db:
+        cur = await db.execute("SELECT * FROM indexer_cursors WHERE app_id = ?", (app_id,))
+        row = await cur.fetchone()
+        return dict(row) if row else None
+
+
+async def save_ingest_page(
+    app_id: int,
+    next_token: Optional[str],
+    last_round: int,
+    counts: dict[str, int],
+) -> None:
+    """Add one page of selector counts and advance the cursor atomically."""
+    async def _op(db: aiosqlite.Connection) -> None:
+        await db.executemany(
+            "INSERT INTO selector_counts (app_id, selector, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(app_id, selector) DO UPDATE SET count = count + excluded.count",
+            [(app_id, sel, n) for sel, n in counts.items()],
+        )
+        await db.execute(
+            "INSERT INTO indexer_cursors (app_id, next_token, last_round, updated) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(app_id) DO UPDATE SET next_token=excluded.next_token, "
+            "last_round=excluded.last_round, updated=excluded.updated",
+            (app_id, next_token, last_round, time.time()),
+        )
+
+    await run_write(_op)
+
+
+async def get_selector_counts() -> dict[int, dict[str, int]]:
+    async with read_db() as db:
+        cur = await db.execute("SELECT app_id, selector, count FROM selector_counts")
+        out: dict[int, dict[str, int]] = {}
+        for r in await cur.fetchall():
+            out.setdefault(r["app_id"], {})[r["selector"]] = r["count"]
+        return out
+
+
+# ── Query-plan check ────────────────────────────────────
+
+# The hot list/lookup queries with representative parameters; each must be
+# served by an index (see migrations.py).
+HOT_QUERIES: list[tuple[str, Sequence[Any]]] = [
+    (_PENDING_TXS_SQL, ()),
+    (_EXPIRED_NONCES_SQL, (0.0, 1000)),
+    (_LIST_CERTS_SQL[0], (101,)),
+    (_LIST_CERTS_SQL[1], (0.0, "", 101)),
+    (_LIST_RECIPIENT_CERTS_SQL[0], ("A" * 58, 101)),
+    (_LIST_RECIPIENT_CERTS_SQL[1], ("A" * 58, 0.0, "", 101)),
+    (_LIST_POLLS_SQL[0], (101,)),
+    (_LIST_POLLS_SQL[1], (0.0, 0, 101)),
+    (_LIST_SESSIONS_SQL[0], (101,)),
+    (_LIST_SESSIONS_SQL[1], (0.0, 0, 101)),
+]
+
+
+async def check_hot_queries() -> int:
+    """Log a warning for every hot query that would scan a table; returns the count."""
+    async with read_db() as db:
+        problems = await explain_full_scans(db, HOT_QUERIES)
+    for sql, detail in problems:
+        logger.warning("query plan regression: %s -> %s", detail, sql)
+    return len(problems)
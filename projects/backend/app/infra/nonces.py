@@ -0,0 +1,126 @@
+"""Expiring storage for auth challenge nonces.
+
+Two interchangeable backends, selected with ``NONCE_BACKEND``:
+
+* ``sqlite`` (default) – the ``nonces`` table; survives restarts and works
+  with several BFF processes sharing one database.
+* ``memory`` – a bounded in-process dict; keeps the login path off SQLite
+  entirely, for single-node deployments.
+
+Both treat a nonce older than ``nonce_ttl_seconds`` as absent.  ``consume``
+removes the nonce only if it is still the current one, so a nonce can be
+used for one login at most.  ``sweep`` deletes expired nonces in batches.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Protocol
+
+from app.config import get_settings
+from app.infra.db.models import consume_nonce, delete_expired_nonces, get_nonce, upsert_nonce
+
+logger = logging.getLogger(__name__)
+
+
+class NonceStore(Protocol):
+    async def put(self, address: str, nonce: str) -> None: ...
+
+    async def get(self, address: str) -> Optional[str]: ...
+
+    async def consume(self, address: str, nonce: str) -> bool: ...
+
+    async def sweep(self) -> int: ...
+
+    def stats(self) -> dict[str, int | str]: ...
+
+
+class SqliteNonceStore:
+    def __init__(self, ttl: float, sweep_batch: int):
+        self._ttl = ttl
+        self._sweep_batch = sweep_batch
+        self.swept = 0
+
+    async def put(self, address: str, nonce: str) -> None:
+        await upsert_nonce(address, nonce)
+
+    async def get(self, address: str) -> Optional[str]:
+        return await get_nonce(address, not_before=time.time() - self._ttl)
+
+    async def consume(self, address: str, nonce: str) -> bool:
+        return await consume_nonce(address, nonce, not_before=time.time() - self._ttl)
+
+    async def sweep(self) -> int:
+        # One short write per batch so the sweep never holds up login writes.
+        cutoff = time.time() - self._ttl
+        total = 0
+        while True:
+            n = await delete_expired_nonces(cutoff, self._sweep_batch)
+            total += n
+            if n < self._sweep_batch:
+                break
+        self.swept += total
+        return total
+
+    def stats(self) -> dict[str, int | str]:
+        return {"backend": "sqlite", "swept": self.swept}
+
+
+class MemoryNonceStore:
+    def __init__(self, ttl: float, max_entries: int):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        # address -> (nonce, monotonic time issued); ordered oldest first
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.swept = 0
+        self.evicted = 0
+
+    async def put(self, address: str, nonce: str) -> None:
+        self._entries[address] = (nonce, time.monotonic())
+        self._entries.move_to_end(address)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    async def get(self, address: str) -> Optional[str]:
+        entry = self._entries.get(address)
+        if entry is None or time.monotonic() - entry[1] > self._ttl:
+            return None
+        return entry[0]
+
+    async def consume(self, address: str, nonce: str) -> bool:
+        if await self.get(address) != nonce:
+            return False
+        del self._entries[address]
+        return True
+
+    async def sweep(self) -> int:
+        cutoff = time.monotonic() - self._ttl
+        n = 0
+        while self._entries:
+            address, (_, issued) = next(iter(self._entries.items()))
+            if issued >= cutoff:
+                break
+            del self._entries[address]
+            n += 1
+        self.swept += n
+        return n
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "swept": self.swept,
+            "evicted": self.evicted,
+        }
+
+
+@lru_cache
+def get_nonce_store() -> NonceStore:
+    s = get_settings()
+    if s.nonce_backend == "memory":
+        return MemoryNonceStore(s.nonce_ttl_seconds, s.nonce_memory_max_entries)
+    return SqliteNonceStore(s.nonce_ttl_seconds, s.nonce_sweep_batch)
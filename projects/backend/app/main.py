@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
@@ -10,8 +11,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.rate_limit import RateLimitMiddleware
-from app.infra.db.database import init_db
+from app.infra.algorand.gateway import shutdown_gateway
+from app.infra.algorand.params import get_params_cache
+from app.infra.algorand.rounds import get_round_watcher
+from app.infra.db.database import close_db, init_db
+from app.infra.db.models import check_hot_queries
+from app.infra.signatures import shutdown_verifier
 from app.api import router as api_router
+from app.usecases import analytics_uc, auth_uc, certificate_uc, tx_uc
 
 
 @asynccontextmanager
@@ -19,7 +26,24 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Startup / shutdown hooks."""
     settings = get_settings()
     await init_db(settings.db_full_path)
+    await check_hot_queries()
+    get_params_cache()  # subscribes to new-block notifications
+    watcher = get_round_watcher()
+    watcher.start()
+    ingester = asyncio.create_task(analytics_uc.run_ingester(), name="analytics-ingester")
+    sweeper = asyncio.create_task(auth_uc.run_nonce_sweeper(), name="nonce-sweeper")
+    await tx_uc.start_watcher()
     yield  # app runs here
+    await certificate_uc.stop_jobs()
+    await tx_uc.stop_watcher()
+    ingester.cancel()
+    sweeper.cancel()
+    # Let both finish unwinding before the gateway and DB they use are closed.
+    await asyncio.gather(ingester, sweeper, return_exceptions=True)
+    await watcher.stop()
+    shutdown_gateway()
+    shutdown_verifier()
+    await close_db()
 
 
 def create_app() -> FastAPI:
@@ -1,61 +1,483 @@
-"""Simple in-memory token-bucket rate limiter for FastAPI."""
+"""In-memory token-bucket rate limiter as a pure ASGI middleware.
+
+Each path prefix in ``Settings.rate_limit_policies`` gets its own bucket table
+(capacity + refill per client).  Clients are identified by the ``sub`` of a
+valid bearer JWT, falling back to the source IP — most of the campus shares a
+few NAT addresses.  A request takes ``rate_limit_costs`` tokens (longest
+matching prefix, default 1) when it is a write (POST/PUT/PATCH/DELETE), so
+expensive chain writes drain a bucket faster than the reads on the same paths,
+which always cost 1.  Independently, ``rate_limit_concurrency`` caps how many
+writes under a prefix run at once.
+
+A table holds at most
+``rate_limit_max_buckets`` buckets in LRU order:
+
+* a bucket that has been idle long enough to refill completely is identical
+  to a fresh one, so it is dropped;
+* past the cap, the least recently used bucket is dropped.
+
+Memory therefore stays bounded however many distinct source addresses show
+up.  Requests outside the configured prefixes pass straight through.
+
+With several uvicorn workers, set ``RATE_LIMIT_BACKEND=shared``: buckets then
+live in a fixed-size memory-mapped hash table (``SharedBucketTable``) that all
+worker processes on the host map, so a client's limit is not multiplied by
+the worker count.  Each update takes an exclusive ``flock`` on the table file
+(POSIX only) and costs a few microseconds.  The concurrency caps then count
+across workers as well (``SharedGateTable``).
+"""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
 import time
-from collections import defaultdict
-from typing import Callable
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Protocol
 
-from fastapi import HTTPException, Request, status
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process backend is available
+    fcntl = None  # type: ignore[assignment]
+
+from app.auth import token_subject
+from app.config import get_settings
 
 
 class _Bucket:
     __slots__ = ("tokens", "last")
 
-    def __init__(self, capacity: float):
+    def __init__(self, capacity: float, now: float):
         self.tokens = capacity
-        self.last = time.monotonic()
+        self.last = now
 
 
 class RateLimiter:
-    """Per-IP token bucket (configurable capacity + refill rate)."""
+    """Per-key token bucket (configurable capacity + refill rate)."""
 
-    def __init__(self, capacity: float = 20.0, refill_per_sec: float = 2.0):
+    def __init__(self, capacity: float = 20.0, refill_per_sec: float = 2.0, max_buckets: int = 100_000):
         self._cap = capacity
         self._rate = refill_per_sec
-        self._buckets: dict[str, _Bucket] = defaultdict(lambda: _Bucket(self._cap))
+        self._max_buckets = max_buckets
+        self._idle = capacity / refill_per_sec  # seconds until an unused bucket is full again
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
 
-    def allow(self, key: str) -> bool:
-        b = self._buckets[key]
+    def allow(self, key: str, cost: float = 1.0) -> bool:
+        return self.acquire(key, cost) == 0.0
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens; returns 0.0 on success, else seconds until they are available."""
+        cost = min(cost, self._cap)
         now = time.monotonic()
-        elapsed = now - b.last
-        b.last = now
-        b.tokens = min(self._cap, b.tokens + elapsed * self._rate)
-        if b.tokens >= 1.0:
-            b.tokens -= 1.0
+        b = self._buckets.get(key)
+        if b is None:
+            self._evict(now)
+            b = self._buckets[key] = _Bucket(self._cap, now)
+        else:
+            self._buckets.move_to_end(key)
+            b.tokens = min(self._cap, b.tokens + (now - b.last) * self._rate)
+            b.last = now
+        if b.tokens >= cost:
+            b.tokens -= cost
+            self.allowed += 1
+            return 0.0
+        self.limited += 1
+        return (cost - b.tokens) / self._rate
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        # Oldest-touched first: stop at the first bucket that is still refilling.
+        while buckets:
+            key, b = next(iter(buckets.items()))
+            if now - b.last < self._idle and len(buckets) < self._max_buckets:
+                break
+            del buckets[key]
+            self.evicted += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buckets": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
+
+
+# ── Cross-process backend ────────────────────────────────
+
+class SharedBucketTable:
+    """Fixed-size token-bucket table in a memory-mapped file.
+
+    Slot layout: ``<Qdd`` = (64-bit key hash, tokens, last update as wall
+    time).  Lookups probe ``_PROBES`` consecutive slots.  A slot is reused
+    once its bucket has fully refilled.  If the whole probe window is busy,
+    the bucket touched longest ago is replaced.
+    """
+
+    _SLOT = struct.Struct("<Qdd")
+    _PROBES = 8
+
+    def __init__(self, path: Path, slots: int):
+        if fcntl is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=shared needs a POSIX host (fcntl.flock)")
+        self._slots = max(slots, self._PROBES)
+        size = self._slots * self._SLOT.size
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, 0)  # (re)sized: start from empty buckets
+                os.ftruncate(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+
+    def acquire(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        h = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+        first = h % self._slots
+        idle = capacity / rate
+        slot = self._SLOT
+        buf = self._map
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            now = time.time()
+            target = free = victim = -1
+            victim_last = math.inf
+            tokens = capacity
+            for i in range(self._PROBES):
+                off = ((first + i) % self._slots) * slot.size
+                k, t, last = slot.unpack_from(buf, off)
+                if k == h:
+                    target = off
+                    tokens = min(capacity, t + max(0.0, now - last) * rate)
+                    break
+                if k == 0 or now - last >= idle:
+                    if free < 0:
+                        free = off
+                elif last < victim_last:
+                    victim, victim_last = off, last
+            if target < 0:
+                target = free if free >= 0 else victim
+            if tokens >= cost:
+                slot.pack_into(buf, target, h, tokens - cost, now)
+                return 0.0
+            slot.pack_into(buf, target, h, tokens, now)
+            return (cost - tokens) / rate
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+class SharedRateLimiter:
+    """``RateLimiter`` interface over a ``SharedBucketTable`` namespace."""
+
+    def __init__(self, table: SharedBucketTable, namespace: str, capacity: float, refill_per_sec: float):
+        self._table = table
+        self._ns = namespace + "\0"
+        self._cap = capacity
+        self._rate = refill_per_sec
+        self.allowed = 0
+        self.limited = 0
+
+    def allow(self, key: str, cost: float = 1.0) -> bool:
+        return self.acquire(key, cost) == 0.0
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        wait = self._table.acquire(self._ns + key, self._cap, self._rate, min(cost, self._cap))
+        if wait:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> dict[str, int]:
+        # allowed/limited are this worker's share; the table itself is shared
+        return {"allowed": self.allowed, "limited": self.limited}
+
+
+class Limiter(Protocol):
+    def acquire(self, key: str, cost: float = 1.0) -> float: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+@lru_cache
+def get_limiters() -> tuple[tuple[str, Limiter], ...]:
+    """(prefix, limiter) per configured policy, longest prefix first."""
+    s = get_settings()
+    policies = sorted(s.rate_limit_policies.items(), key=lambda kv: len(kv[0]), reverse=True)
+    if s.rate_limit_backend == "shared":
+        table = SharedBucketTable(Path(s.rate_limit_shared_path), s.rate_limit_max_buckets * len(policies))
+        return tuple(
+            (prefix, SharedRateLimiter(table, prefix, capacity, refill))
+            for prefix, (capacity, refill) in policies
+        )
+    return tuple(
+        (prefix, RateLimiter(capacity, refill, s.rate_limit_max_buckets))
+        for prefix, (capacity, refill) in policies
+    )
+
+
+def _longest_prefix(table: dict[str, float], path: str, default: float) -> float:
+    best = ""
+    for prefix in table:
+        if len(prefix) > len(best) and path.startswith(prefix):
+            best = prefix
+    return table[best] if best else default
+
+
+def _match(path: str) -> Optional[Limiter]:
+    for prefix, limiter in get_limiters():
+        if path.startswith(prefix):
+            return limiter
+    return None
+
+
+# ── Concurrency limits ───────────────────────────────────
+
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ConcurrencyGate:
+    """Caps in-flight requests; callers that find it full are rejected, not queued."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.rejected = 0
+
+    def try_enter(self) -> bool:
+        if self.active >= self.limit:
+            self.rejected += 1
+            return False
+        self.active += 1
+        return True
+
+    def leave(self) -> None:
+        self.active -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {"limit": self.limit, "active": self.active, "rejected": self.rejected}
+
+
+class SharedGateTable:
+    """In-flight counters shared by the worker processes on a host.
+
+    Slot layout: ``<QQq`` = (64-bit gate hash, worker pid, active count).  Each
+    worker only changes its own slot per gate; a gate's load is the sum over
+    the slots of live workers.  A worker that dies mid-request therefore
+    cannot leak its count: its slot is cleared the next time the gate is
+    counted.  The table is small and scanned whole under ``flock``.
+    """
+
+    _SLOT = struct.Struct("<QQq")
+
+    def __init__(self, path: Path, slots: int = 1024):
+        if fcntl is None:
+            raise RuntimeError("RATE_LIMIT_BACKEND=shared needs a POSIX host (fcntl.flock)")
+        self._slots = slots
+        size = slots * self._SLOT.size
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+            self._map = mmap.mmap(self._fd, size)
+            # A recycled pid must not inherit a dead worker's counts.
+            for off in range(0, size, self._SLOT.size):
+                if self._SLOT.unpack_from(self._map, off)[1] == self._pid:
+                    self._SLOT.pack_into(self._map, off, 0, 0, 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def adjust(self, gate: int, limit: int, delta: int) -> bool:
+        """Add ``delta`` to this worker's count for ``gate``; an increment is refused at ``limit``."""
+        slot = self._SLOT
+        buf = self._map
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            total = 0
+            own = free = -1
+            for off in range(0, self._slots * slot.size, slot.size):
+                h, pid, active = slot.unpack_from(buf, off)
+                if h == 0:
+                    if free < 0:
+                        free = off
+                elif h == gate:
+                    if pid == self._pid:
+                        own = off
+                        total += active
+                    elif self._alive(pid):
+                        total += active
+                    else:
+                        slot.pack_into(buf, off, 0, 0, 0)
+                        if free < 0:
+                            free = off
+            if delta > 0 and total + delta > limit:
+                return False
+            if own >= 0:
+                active = slot.unpack_from(buf, own)[2] + delta
+            elif free >= 0:
+                own, active = free, delta
+            else:  # table full: fail open rather than wedge the route
+                return True
+            if active > 0:
+                slot.pack_into(buf, own, gate, self._pid, active)
+            else:
+                slot.pack_into(buf, own, 0, 0, 0)
             return True
-        return False
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class SharedConcurrencyGate:
+    """``ConcurrencyGate`` interface over a ``SharedGateTable`` entry."""
+
+    def __init__(self, table: SharedGateTable, prefix: str, limit: int):
+        self._table = table
+        self._key = int.from_bytes(hashlib.blake2b(prefix.encode(), digest_size=8).digest(), "little") or 1
+        self.limit = limit
+        self.active = 0  # this worker's share
+        self.rejected = 0
+
+    def try_enter(self) -> bool:
+        if not self._table.adjust(self._key, self.limit, 1):
+            self.rejected += 1
+            return False
+        self.active += 1
+        return True
+
+    def leave(self) -> None:
+        self._table.adjust(self._key, self.limit, -1)
+        self.active -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {"limit": self.limit, "active": self.active, "rejected": self.rejected}
+
+
+class Gate(Protocol):
+    def try_enter(self) -> bool: ...
+
+    def leave(self) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+@lru_cache
+def get_gates() -> tuple[tuple[str, Gate], ...]:
+    """(prefix, gate) per ``rate_limit_concurrency`` entry, longest prefix first."""
+    s = get_settings()
+    limits = sorted(s.rate_limit_concurrency.items(), key=lambda kv: len(kv[0]), reverse=True)
+    if s.rate_limit_backend == "shared" and limits:
+        table = SharedGateTable(Path(s.rate_limit_shared_path + ".gates"))
+        return tuple((prefix, SharedConcurrencyGate(table, prefix, limit)) for prefix, limit in limits)
+    return tuple((prefix, ConcurrencyGate(limit)) for prefix, limit in limits)
+
+
+def _gate(scope: Scope) -> Optional[Gate]:
+    if scope["method"] not in _WRITE_METHODS:
+        return None
+    for prefix, gate in get_gates():
+        if scope["path"].startswith(prefix):
+            return gate
+    return None
+
+
+# ── Client identity ──────────────────────────────────────
+
+def _client_key(scope: Scope) -> str:
+    """``sub:<address>`` for a valid bearer token, else ``ip:<host>``."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                sub = token_subject(token.strip())
+                if sub:
+                    return "sub:" + sub
+            break
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+def rate_limit_stats() -> dict[str, dict[str, dict[str, int]]]:
+    return {
+        "buckets": {prefix: limiter.stats() for prefix, limiter in get_limiters()},
+        "concurrency": {prefix: gate.stats() for prefix, gate in get_gates()},
+    }
+
+
+_BODY = json.dumps({"detail": "rate limit exceeded — try again shortly"}).encode()
+_BUSY_BODY = json.dumps({"detail": "too many concurrent chain writes — try again shortly"}).encode()
 
 
-_limiter = RateLimiter()
+class RateLimitMiddleware:
+    """Pure ASGI middleware — answers 429 when the client's bucket is empty
+    or the route's concurrency limit is reached."""
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Drop-in ASGI middleware — returns 429 when bucket is empty."""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        gate = _gate(scope)
+        if gate is not None and not gate.try_enter():
+            await _reject(send, 1.0, _BUSY_BODY)
+            return
+        try:
+            limiter = _match(path)
+            if limiter is not None:
+                cost = 1.0
+                if scope["method"] in _WRITE_METHODS:
+                    cost = _longest_prefix(get_settings().rate_limit_costs, path, 1.0)
+                retry_after = limiter.acquire(_client_key(scope), cost)
+                if retry_after:
+                    await _reject(send, retry_after, _BODY)
+                    return
+            await self.app(scope, receive, send)
+        finally:
+            if gate is not None:
+                gate.leave()
 
-    RATE_LIMITED_PREFIXES = ("/auth/", "/admin/")
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        path = request.url.path
-        if any(path.startswith(p) for p in self.RATE_LIMITED_PREFIXES):
-            ip = request.client.host if request.client else "unknown"
-            if not _limiter.allow(ip):
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="rate limit exceeded — try again shortly",
-                )
-        return await call_next(request)
+async def _reject(send: Send, retry_after: float, body: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(math.ceil(retry_after)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
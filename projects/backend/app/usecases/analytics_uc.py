@@ -1,11 +1,98 @@
-"""Analytics use-case backed by Indexer queries."""
+"""Analytics use-case backed by incrementally ingested Indexer data.
+
+A background ingester pages through every app-call transaction with the
+Indexer ``next`` token, persisting its cursor and per-selector counters in
+SQLite.  ``summary()`` only reads those counters, so it never rescans the
+Indexer and does not undercount once an app passes one page of calls.
+
+The summary itself is cached per confirmed round (stale-while-revalidate), so
+every open dashboard tab polling it costs at most one recomputation per block.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import logging
+from functools import lru_cache
+
+from app.config import get_settings
 from app.domain.models import AnalyticsSummary
-from app.infra.algorand.indexer import get_analytics_summary as _raw
+from app.infra.algorand.client import get_app_ids
+from app.infra.algorand.indexer import count_by_selector, iter_app_txns, summarize
+from app.infra.algorand.rounds import get_round_watcher
+from app.infra.cache import RoundCache
+from app.infra.db.models import get_indexer_cursor, get_selector_counts, save_ingest_page
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_summary_cache() -> RoundCache[str, AnalyticsSummary]:
+    watcher = get_round_watcher()
+    return RoundCache(
+        lambda: watcher.latest,
+        max_entries=1,
+        max_age=get_settings().analytics_cache_max_age,
+    )
 
 
 async def summary() -> AnalyticsSummary:
-    data = _raw()
-    return AnalyticsSummary(**data)
+    return await get_summary_cache().get("summary", _compute_summary)
+
+
+async def _compute_summary() -> AnalyticsSummary:
+    try:
+        ids = get_app_ids()
+    except FileNotFoundError:
+        return AnalyticsSummary()
+    counts = await get_selector_counts()
+    return AnalyticsSummary(**summarize({name: counts.get(app_id, {}) for name, app_id in ids.items()}))
+
+
+# ── Ingestion ────────────────────────────────────────────
+
+async def _ingest_app(app_id: int) -> int:
+    """Consume every new app-call txn for ``app_id``; returns how many were ingested."""
+    cursor = await get_indexer_cursor(app_id)
+    token = cursor["next_token"] if cursor else None
+    last_round = cursor["last_round"] if cursor else 0
+    ingested = 0
+    pages = iter_app_txns(
+        app_id,
+        next_token=token,
+        # Without a token, resume from the round after the last ingested one.
+        min_round=None if token or not last_round else last_round + 1,
+    )
+    async for txns, next_token in pages:
+        last_round = max(last_round, max(tx.get("confirmed-round", 0) for tx in txns))
+        await save_ingest_page(app_id, next_token, last_round, count_by_selector(txns))
+        ingested += len(txns)
+    return ingested
+
+
+async def _ingest_app_safe(name: str, app_id: int) -> int:
+    try:
+        return await _ingest_app(app_id)
+    except Exception:
+        logger.debug("analytics ingest failed for %s (app %d)", name, app_id, exc_info=True)
+        return 0
+
+
+async def ingest_once() -> int:
+    """One ingestion pass; the per-app scans run concurrently."""
+    try:
+        ids = get_app_ids()
+    except FileNotFoundError:
+        return 0
+    counts = await asyncio.gather(*(_ingest_app_safe(name, app_id) for name, app_id in ids.items()))
+    return sum(counts)
+
+
+async def run_ingester() -> None:
+    """Background loop: ingest new app calls every ``analytics_ingest_interval`` s."""
+    interval = get_settings().analytics_ingest_interval
+    while True:
+        n = await ingest_once()
+        if n:
+            logger.info("analytics ingester: %d new app calls", n)
+        await asyncio.sleep(interval)
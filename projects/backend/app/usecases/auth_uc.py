@@ -1,55 +1,62 @@
-"""Auth use-cases: nonce generation and Algorand signature verification."""
+"""Auth use-cases: nonce generation and Algorand signature verification.
+
+Nonces expire after ``nonce_ttl_seconds``; ``run_nonce_sweeper`` removes the
+expired ones so abandoned logins do not accumulate.
+"""
 
 from __future__ import annotations
 
-import base64
+import asyncio
+import logging
 import secrets
 
-from algosdk import encoding
-from nacl.signing import VerifyKey
-from nacl.exceptions import BadSignatureError
-
-from app.infra.db.models import upsert_nonce, get_nonce, delete_nonce, get_role
+from app.config import get_settings
+from app.infra.db.models import get_role
+from app.infra.nonces import get_nonce_store
+from app.infra.signatures import get_verifier
 from app.auth import create_jwt
 
+logger = logging.getLogger(__name__)
+
 
 async def generate_nonce(address: str) -> str:
     """Create a random nonce, store it, and return it."""
     nonce = secrets.token_hex(16)
-    await upsert_nonce(address, nonce)
+    await get_nonce_store().put(address, nonce)
     return nonce
 
 
-def _verify_signature(address: str, message: bytes, signature_b64: str) -> bool:
-    """Verify an Ed25519 signature produced by an Algorand wallet.
-
-    The wallet signs the raw message bytes with the account's Ed25519 key.
-    """
-    try:
-        sig_bytes = base64.b64decode(signature_b64)
-        # Decode the Algorand address to get the 32-byte public key
-        pk_bytes = encoding.decode_address(address)
-        verify_key = VerifyKey(pk_bytes)
-        verify_key.verify(message, sig_bytes)
-        return True
-    except (BadSignatureError, Exception):
-        return False
-
-
 async def verify_and_issue_jwt(address: str, nonce: str, signature: str) -> str | None:
     """Verify nonce + signature, issue JWT, and clear the nonce.
 
     Returns the JWT string on success, or None on failure.
     """
-    stored = await get_nonce(address)
+    store = get_nonce_store()
+    stored = await store.get(address)  # None once expired
     if stored is None or stored != nonce:
         return None
 
     message = f"AlgoCampus auth nonce: {nonce}".encode()
-    if not _verify_signature(address, message, signature):
+    if not await get_verifier().verify(address, message, signature):
         return None
 
-    await delete_nonce(address)
+    # Single use: a concurrent verify with the same nonce loses here.
+    if not await store.consume(address, nonce):
+        return None
 
     role = await get_role(address)
     return create_jwt(address, role)
+
+
+async def run_nonce_sweeper() -> None:
+    """Background loop: delete expired nonces every ``nonce_sweep_interval`` s."""
+    interval = get_settings().nonce_sweep_interval
+    store = get_nonce_store()
+    while True:
+        try:
+            n = await store.sweep()
+            if n:
+                logger.info("nonce sweeper: removed %d expired nonces", n)
+        except Exception:
+            logger.exception("nonce sweep failed")
+        await asyncio.sleep(interval)
@@ -4,26 +4,44 @@ Flow:
   1. Build ARC-3 metadata JSON and persist locally (served by BFF).
   2. Mint an ASA/NFT on LocalNet via algod (using KMD dev account).
   3. Register cert_hash on-chain in CertificateRegistryContract.
+
+Batch issuance runs the same flow as a background job: metadata is hashed and
+persisted in bulk, mints and registrations go out as 16-txn groups, and
+several groups are kept in flight at once so throughput is bounded by block
+capacity rather than per-certificate round trips.  Job handles live in the
+memory of the worker process that started the job (the most recent
+``_MAX_JOBS``).  With several uvicorn workers, a job can only be polled on
+that worker; jobs still running at shutdown are cancelled.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
 import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
 
-from algosdk import transaction, encoding
+from algosdk import transaction
 from algosdk.abi import Method
-from algosdk.atomic_transaction_composer import (
-    AtomicTransactionComposer,
-    AccountTransactionSigner,
-)
+from algosdk.atomic_transaction_composer import AtomicTransactionComposer
 
 from app.config import get_settings
-from app.domain.models import IssueCertRequest, IssueCertResponse
-from app.infra.algorand.client import get_algod, get_app_ids, get_localnet_default_account
-from app.infra.db.models import store_cert_metadata
+from app.domain.models import CertJobStatus, IssueCertRequest, IssueCertResponse
+from app.infra.algorand.client import get_algod, get_app_ids
+from app.infra.algorand.gateway import run_algod, run_algod_wait
+from app.infra.algorand.params import get_suggested_params
+from app.infra.algorand.signer import DevAccount, get_dev_account
+from app.infra.db.models import (
+    delete_unminted_cert_metadata,
+    set_cert_asset_ids,
+    store_cert_metadata,
+    store_cert_metadata_bulk,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -31,30 +49,36 @@ _REGISTER = Method.from_signature(
     "register_cert(byte[],address,uint64,uint64)bool"
 )
 
+_GROUP = AtomicTransactionComposer.MAX_GROUP_SIZE
+_MAX_JOBS = 100
 
-async def issue(req: IssueCertRequest) -> IssueCertResponse:
-    """Full certificate issuance pipeline."""
 
-    settings = get_settings()
-    algod_client = get_algod()
-    sender, sk = get_localnet_default_account()
-    sp = algod_client.suggested_params()
+@dataclass
+class _Cert:
+    """A certificate prepared for minting (hash + ARC-3 metadata)."""
+    req: IssueCertRequest
+    cert_hash: bytes
+    issued_ts: int
+    metadata_url: str
+    arc3: dict[str, Any]
+
+    @property
+    def cert_hash_hex(self) -> str:
+        return self.cert_hash.hex()
 
-    # 1 ── build canonical payload + hash ─────────────────
+
+def _prepare(req: IssueCertRequest, issued_ts: int, base_url: str) -> _Cert:
+    """Build the canonical payload, its hash and the ARC-3 metadata."""
     canonical = {
         "recipient": req.recipient_address,
         "name": req.recipient_name,
         "course": req.course_code,
         "title": req.title,
         "description": req.description,
-        "issued_ts": int(time.time()),
+        "issued_ts": issued_ts,
     }
     canonical_bytes = json.dumps(canonical, sort_keys=True, separators=(",", ":")).encode()
     cert_hash = hashlib.sha256(canonical_bytes).digest()
-    cert_hash_hex = cert_hash.hex()
-
-    # 2 ── persist ARC-3 metadata locally ─────────────────
-    metadata_url = f"{settings.bff_base_url}/metadata/cert/{cert_hash_hex}.json"
     arc3 = {
         "name": f"Certificate: {req.title}",
         "description": req.description or f"AlgoCampus certificate for {req.course_code}",
@@ -63,69 +87,270 @@ async def issue(req: IssueCertRequest) -> IssueCertResponse:
             "recipient": req.recipient_address,
             "recipient_name": req.recipient_name,
             "course_code": req.course_code,
-            "issued_ts": canonical["issued_ts"],
+            "issued_ts": issued_ts,
         },
     }
+    return _Cert(
+        req=req,
+        cert_hash=cert_hash,
+        issued_ts=issued_ts,
+        metadata_url=f"{base_url}/metadata/cert/{cert_hash.hex()}.json",
+        arc3=arc3,
+    )
+
 
-    # 3 ── mint ASA/NFT (total=1, decimals=0) ─────────────
-    txn_create = transaction.AssetConfigTxn(
+def _mint_txn(cert: _Cert, sender: str, sp: transaction.SuggestedParams) -> transaction.AssetConfigTxn:
+    """ASA/NFT creation (total=1, decimals=0) pointing at the local metadata URL."""
+    return transaction.AssetConfigTxn(
         sender=sender,
         sp=sp,
         total=1,
         decimals=0,
         default_frozen=False,
         unit_name="CERT",
-        asset_name=f"AC-{req.course_code[:8]}",
-        url=metadata_url,
+        asset_name=f"AC-{cert.req.course_code[:8]}",
+        url=cert.metadata_url,
         manager=sender,
         reserve=sender,
         strict_empty_address_check=False,
     )
-    signed = txn_create.sign(sk)
-    tx_id = algod_client.send_transaction(signed)
-    result = transaction.wait_for_confirmation(algod_client, tx_id, 4)
+
+
+def _add_register_call(
+    atc: AtomicTransactionComposer,
+    acct: DevAccount,
+    sp: transaction.SuggestedParams,
+    app_id: int,
+    cert: _Cert,
+    asset_id: int,
+) -> None:
+    atc.add_method_call(
+        app_id=app_id,
+        method=_REGISTER,
+        sender=acct.address,
+        sp=sp,
+        signer=acct.signer,
+        method_args=[cert.cert_hash, cert.req.recipient_address, asset_id, cert.issued_ts],
+        boxes=[(app_id, prefix + cert.cert_hash) for prefix in (b"cr", b"ca", b"ct")],
+    )
+
+
+async def issue(req: IssueCertRequest) -> IssueCertResponse:
+    """Full certificate issuance pipeline."""
+
+    settings = get_settings()
+    algod_client = get_algod()
+    acct = await get_dev_account()
+    sender = acct.address
+    sp = await get_suggested_params()
+
+    # 1 ── build canonical payload + hash + ARC-3 metadata ─
+    cert = _prepare(req, int(time.time()), settings.bff_base_url)
+
+    # 2 ── mint ASA/NFT (total=1, decimals=0) ─────────────
+    signed = _mint_txn(cert, sender, sp).sign(acct.private_key)
+    tx_id = await run_algod(algod_client.send_transaction, signed)
+    result = await run_algod_wait(transaction.wait_for_confirmation, algod_client, tx_id, 4)
     asset_id = result["asset-index"]
     logger.info("Minted ASA %d  tx=%s", asset_id, tx_id)
 
     # (Optional) opt-in recipient + transfer the NFT
     # Skipped for LocalNet hackathon — the dev account holds the NFT
 
-    # 4 ── register cert_hash on-chain via ATC ────────────
+    # 3 ── register cert_hash on-chain via ATC ────────────
     try:
         ids = get_app_ids()
         cert_app_id = ids.get("CertificateRegistryContract")
         if cert_app_id:
             atc = AtomicTransactionComposer()
-            signer = AccountTransactionSigner(sk)
-            atc.add_method_call(
-                app_id=cert_app_id,
-                method=_REGISTER,
-                sender=sender,
-                sp=sp,
-                signer=signer,
-                method_args=[
-                    cert_hash,
-                    req.recipient_address,
-                    asset_id,
-                    canonical["issued_ts"],
-                ],
-            )
-            atc_result = atc.execute(algod_client, wait_rounds=4)
+            _add_register_call(atc, acct, sp, cert_app_id, cert, asset_id)
+            atc_result = await run_algod_wait(atc.execute, algod_client, 4)
             logger.info("Cert registered on-chain tx=%s", atc_result.tx_ids[0])
     except Exception:
         logger.exception("On-chain cert registration failed (non-fatal)")
 
-    # 5 ── persist metadata in SQLite ─────────────────────
+    # 4 ── persist metadata in SQLite ─────────────────────
     await store_cert_metadata(
-        cert_hash=cert_hash_hex,
+        cert_hash=cert.cert_hash_hex,
         recipient=req.recipient_address,
         asset_id=asset_id,
-        metadata_json=json.dumps(arc3),
+        metadata_json=json.dumps(cert.arc3),
     )
 
     return IssueCertResponse(
-        cert_hash=cert_hash_hex,
+        cert_hash=cert.cert_hash_hex,
         asset_id=asset_id,
-        metadata_url=metadata_url,
+        metadata_url=cert.metadata_url,
         tx_id=tx_id,
     )
+
+
+# ── Batch issuance ───────────────────────────────────────
+
+class _CertJob:
+    def __init__(self, total: int):
+        self.job_id = uuid.uuid4().hex
+        self.status = "queued"
+        self.total = total
+        self.minted = 0
+        self.registered = 0
+        self.results: list[IssueCertResponse] = []
+        self.errors: list[dict[str, Any]] = []
+        self.skipped: list[dict[str, Any]] = []
+        self.created = time.time()
+        self.finished: float | None = None
+        self.task: asyncio.Task | None = None
+
+    def snapshot(self) -> CertJobStatus:
+        return CertJobStatus(
+            job_id=self.job_id,
+            status=self.status,
+            total=self.total,
+            minted=self.minted,
+            registered=self.registered,
+            failed=len(self.errors),
+            results=list(self.results),
+            errors=list(self.errors),
+            skipped=list(self.skipped),
+            created=self.created,
+            finished=self.finished,
+        )
+
+
+_jobs: OrderedDict[str, _CertJob] = OrderedDict()
+
+
+def _remember(job: _CertJob) -> None:
+    _jobs[job.job_id] = job
+    while len(_jobs) > _MAX_JOBS:
+        oldest_id, oldest = next(iter(_jobs.items()))
+        if oldest.finished is None:
+            break  # never drop a running job
+        del _jobs[oldest_id]
+
+
+async def issue_batch(reqs: list[IssueCertRequest]) -> CertJobStatus:
+    """Start a background batch issuance job and return its handle."""
+    job = _CertJob(total=len(reqs))
+    _remember(job)
+    job.task = asyncio.create_task(_run_batch(job, reqs), name=f"cert-batch-{job.job_id}")
+    return job.snapshot()
+
+
+def get_job(job_id: str) -> CertJobStatus | None:
+    job = _jobs.get(job_id)
+    return job.snapshot() if job else None
+
+
+async def stop_jobs() -> None:
+    """Cancel running batch jobs and wait for them to unwind (app shutdown)."""
+    tasks = [job.task for job in _jobs.values() if job.task is not None and not job.task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _run_batch(job: _CertJob, reqs: list[IssueCertRequest]) -> None:
+    settings = get_settings()
+    job.status = "running"
+    certs: list[_Cert] = []
+    try:
+        # 1 ── hash everything, drop in-batch duplicates, persist in bulk ─
+        issued_ts = int(time.time())
+        seen: set[bytes] = set()
+        for i, req in enumerate(reqs):
+            cert = _prepare(req, issued_ts, settings.bff_base_url)
+            if cert.cert_hash in seen:
+                job.skipped.append({"index": i, "cert_hash": cert.cert_hash_hex, "reason": "duplicate in batch"})
+                continue
+            seen.add(cert.cert_hash)
+            certs.append(cert)
+
+        await store_cert_metadata_bulk(
+            [(c.cert_hash_hex, c.req.recipient_address, json.dumps(c.arc3)) for c in certs]
+        )
+
+        try:
+            cert_app_id = get_app_ids().get("CertificateRegistryContract")
+        except FileNotFoundError:
+            cert_app_id = None
+
+        # 2 ── pipeline 16-cert chunks, several groups in flight ──────────
+        inflight = asyncio.Semaphore(settings.cert_batch_inflight_groups)
+
+        async def _chunk(chunk: list[_Cert]) -> None:
+            async with inflight:
+                await _issue_chunk(job, chunk, cert_app_id)
+
+        await asyncio.gather(
+            *(_chunk(certs[i:i + _GROUP]) for i in range(0, len(certs), _GROUP))
+        )
+        job.status = "done" if not job.errors else "partial" if job.minted else "failed"
+    except asyncio.CancelledError:
+        # Rows of chunks that never minted stay hidden (asset_id IS NULL).
+        job.status = "cancelled"
+        raise
+    except Exception:
+        logger.exception("Batch cert job %s crashed", job.job_id)
+        job.status = "failed"
+        if certs:
+            await delete_unminted_cert_metadata([c.cert_hash_hex for c in certs])
+    finally:
+        job.finished = time.time()
+        logger.info(
+            "Batch cert job %s %s: minted=%d registered=%d failed=%d skipped=%d",
+            job.job_id, job.status, job.minted, job.registered, len(job.errors), len(job.skipped),
+        )
+
+
+async def _issue_chunk(job: _CertJob, chunk: list[_Cert], cert_app_id: int | None) -> None:
+    """Mint one group of up to 16 NFTs, then register them as one group."""
+    algod = get_algod()
+    acct = await get_dev_account()
+
+    # ── mint group ──────────
+    sp = await get_suggested_params()
+    txns = [_mint_txn(c, acct.address, sp) for c in chunk]
+    transaction.assign_group_id(txns)
+    signed = [t.sign(acct.private_key) for t in txns]
+    mint_ids = [t.get_txid() for t in txns]
+    try:
+        await run_algod(algod.send_transactions, signed)
+        await run_algod_wait(transaction.wait_for_confirmation, algod, mint_ids[0], 4)
+        infos = await asyncio.gather(
+            *(run_algod(algod.pending_transaction_info, tx_id) for tx_id in mint_ids)
+        )
+    except Exception as exc:
+        logger.exception("Mint group of %d certs failed", len(chunk))
+        for c in chunk:
+            job.errors.append({"cert_hash": c.cert_hash_hex, "error": f"mint failed: {exc}"})
+        await delete_unminted_cert_metadata([c.cert_hash_hex for c in chunk])
+        return
+
+    asset_ids = [int(info["asset-index"]) for info in infos]
+    await set_cert_asset_ids([(a, c.cert_hash_hex) for a, c in zip(asset_ids, chunk)])
+    job.minted += len(chunk)
+    job.results.extend(
+        IssueCertResponse(
+            cert_hash=c.cert_hash_hex,
+            asset_id=a,
+            metadata_url=c.metadata_url,
+            tx_id=tx_id,
+        )
+        for c, a, tx_id in zip(chunk, asset_ids, mint_ids)
+    )
+
+    # ── register group ──────
+    if not cert_app_id:
+        return
+    sp = await get_suggested_params()
+    atc = AtomicTransactionComposer()
+    for c, a in zip(chunk, asset_ids):
+        _add_register_call(atc, acct, sp, cert_app_id, c, a)
+    try:
+        await run_algod_wait(atc.execute, algod, 4)
+        job.registered += len(chunk)
+    except Exception as exc:
+        logger.exception("Register group of %d certs failed", len(chunk))
+        for c in chunk:
+            job.errors.append({"cert_hash": c.cert_hash_hex, "error": f"register failed: {exc}"})
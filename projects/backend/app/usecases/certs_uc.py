@@ -5,41 +5,26 @@ from __future__ import annotations
 import logging
 
 from app.config import get_settings
-from app.domain.models import CertListItem, CertListResponse, CertVerifyResponse
+from app.domain.models import CertListItem, CertVerifyResponse
+from app.domain.serialization import RowEncoder
 from app.infra.algorand.chain import verify_cert_on_chain
 from app.infra.db.models import list_certs, list_certs_for_recipient
 
 logger = logging.getLogger(__name__)
 
+_cert_encoder = RowEncoder(CertListItem)
 
-async def list_all(limit: int = 100, offset: int = 0) -> CertListResponse:
-    """List certificates from SQLite BFF cache."""
-    rows = await list_certs(limit=limit, offset=offset)
-    items = [
-        CertListItem(
-            cert_hash=r["cert_hash"],
-            recipient=r["recipient"],
-            asset_id=r.get("asset_id"),
-            created=r.get("created"),
-        )
-        for r in rows
-    ]
-    return CertListResponse(certs=items, count=len(items))
 
+async def list_json(limit: int = 100, cursor: str | None = None) -> bytes:
+    """Page of certificates from SQLite BFF cache as ``CertListResponse`` JSON."""
+    rows, next_cursor = await list_certs(limit=limit, cursor=cursor)
+    return _cert_encoder.encode_page("certs", rows, next_cursor)
 
-async def list_for_address(address: str, limit: int = 100) -> CertListResponse:
-    """List certificates for a specific recipient address."""
-    rows = await list_certs_for_recipient(address, limit=limit)
-    items = [
-        CertListItem(
-            cert_hash=r["cert_hash"],
-            recipient=r["recipient"],
-            asset_id=r.get("asset_id"),
-            created=r.get("created"),
-        )
-        for r in rows
-    ]
-    return CertListResponse(certs=items, count=len(items))
+
+async def list_for_address_json(address: str, limit: int = 100, cursor: str | None = None) -> bytes:
+    """Page of certificates for a specific recipient address."""
+    rows, next_cursor = await list_certs_for_recipient(address, limit=limit, cursor=cursor)
+    return _cert_encoder.encode_page("certs", rows, next_cursor)
 
 
 async def verify(cert_hash_hex: str) -> CertVerifyResponse:
@@ -53,7 +38,7 @@ async def verify(cert_hash_hex: str) -> CertVerifyResponse:
             message="invalid hex hash",
         )
 
-    result = verify_cert_on_chain(cert_hash_bytes)
+    result = await verify_cert_on_chain(cert_hash_bytes)
     if result is None:
         return CertVerifyResponse(
             valid=False,
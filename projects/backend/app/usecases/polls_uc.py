@@ -4,18 +4,27 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 
-from app.domain.models import CreatePollRequest, PollResponse, PollListResponse
+from app.config import get_settings
+from app.domain.models import CreatePollRequest, PollOptionResult, PollResponse, PollResultsResponse
+from app.domain.serialization import RowEncoder
+from app.infra.algorand.boxes import itob, btoi, read_boxes
 from app.infra.algorand.chain import create_poll_on_chain
 from app.infra.algorand.client import get_app_ids
+from app.infra.algorand.rounds import get_round_watcher
+from app.infra.cache import RoundCache
 from app.infra.db.models import insert_poll, list_polls, get_poll
 
 logger = logging.getLogger(__name__)
 
+# options_json is written by create() with json.dumps, so it is spliced as-is.
+_poll_encoder = RowEncoder(PollResponse, raw={"options": "options_json"})
+
 
 async def create(req: CreatePollRequest, creator: str) -> PollResponse:
     """Create a poll on-chain and cache in SQLite."""
-    poll_id, tx_id = create_poll_on_chain(
+    poll_id, tx_id = await create_poll_on_chain(
         question=req.question,
         options=req.options,
         start_round=req.start_round,
@@ -46,39 +55,52 @@ async def create(req: CreatePollRequest, creator: str) -> PollResponse:
     )
 
 
-async def list_all(limit: int = 100, offset: int = 0) -> PollListResponse:
-    """List polls from SQLite cache (Indexer-backed initial population)."""
-    rows = await list_polls(limit=limit, offset=offset)
-    polls = [
-        PollResponse(
-            poll_id=r["poll_id"],
-            question=r["question"],
-            options=json.loads(r["options_json"]),
-            start_round=r["start_round"],
-            end_round=r["end_round"],
-            creator=r["creator"],
-            app_id=r["app_id"],
-            tx_id=r.get("tx_id"),
-            created=r.get("created"),
-        )
-        for r in rows
-    ]
-    return PollListResponse(polls=polls, count=len(polls))
-
-
-async def get_by_id(poll_id: int) -> PollResponse | None:
-    """Retrieve a single poll from BFF cache."""
-    r = await get_poll(poll_id)
-    if r is None:
+async def list_json(limit: int = 100, cursor: str | None = None) -> bytes:
+    """Page of polls from SQLite cache as ``PollListResponse`` JSON."""
+    rows, next_cursor = await list_polls(limit=limit, cursor=cursor)
+    return _poll_encoder.encode_page("polls", rows, next_cursor)
+
+
+async def get_json(poll_id: int) -> bytes | None:
+    """Single poll from BFF cache as ``PollResponse`` JSON."""
+    row = await get_poll(poll_id)
+    return None if row is None else _poll_encoder.encode(row)
+
+
+# ── Live results ─────────────────────────────────────────
+
+@lru_cache
+def get_results_cache() -> RoundCache[int, PollResultsResponse]:
+    watcher = get_round_watcher()
+    s = get_settings()
+    return RoundCache(
+        lambda: watcher.latest,
+        max_entries=s.poll_results_cache_size,
+        max_age=s.poll_results_cache_max_age,
+    )
+
+
+async def results(poll_id: int) -> PollResultsResponse | None:
+    """Current tallies, recomputed at most once per confirmed round per poll."""
+    try:
+        return await get_results_cache().get(poll_id, lambda: _read_results(poll_id))
+    except KeyError:
         return None
-    return PollResponse(
-        poll_id=r["poll_id"],
-        question=r["question"],
-        options=json.loads(r["options_json"]),
-        start_round=r["start_round"],
-        end_round=r["end_round"],
-        creator=r["creator"],
-        app_id=r["app_id"],
-        tx_id=r.get("tx_id"),
-        created=r.get("created"),
+
+
+async def _read_results(poll_id: int) -> PollResultsResponse:
+    row = await get_poll(poll_id)
+    if row is None:
+        raise KeyError(poll_id)  # unknown polls are not cached: one may be created this round
+    rnd = get_round_watcher().latest
+    options = json.loads(row["options_json"])
+    # VotingContract.vote_counts: key = b"vc" + itob(poll_id) + itob(option_idx), value = uint64
+    pid = itob(poll_id)
+    values = await read_boxes(row["app_id"], [b"vc" + pid + itob(i) for i in range(len(options))])
+    counts = [btoi(v) if v else 0 for v in values]
+    return PollResultsResponse(
+        poll_id=poll_id,
+        round=rnd,
+        total_votes=sum(counts),
+        results=[PollOptionResult(index=i, option=o, votes=n) for i, (o, n) in enumerate(zip(options, counts))],
     )
@@ -2,21 +2,124 @@
 
 from __future__ import annotations
 
+import csv
+import json
 import logging
+from typing import AsyncIterator, Iterable
 
-from app.infra.db.models import upsert_role
-from app.infra.algorand.chain import push_role_on_chain
+from algosdk import encoding
+
+from app.domain.models import Role, SetRoleResponse
+from app.infra.db.models import upsert_role, upsert_roles
+from app.infra.algorand.chain import push_role_on_chain, push_roles_on_chain
+from app.usecases import tx_uc
 
 logger = logging.getLogger(__name__)
 
+MAX_BULK_ROWS = 5000
+
 
-async def set_role(address: str, role: str) -> str:
-    """Store role locally and push to on-chain allowlists.
+async def set_role(address: str, role: str, *, wait: bool = True) -> SetRoleResponse:
+    """Store role locally and push to on-chain allowlists (one atomic group).
 
-    Returns a human-readable status message.
+    With ``wait=False`` the group is submitted without waiting for confirmation
+    and its tx_id is registered with the tx tracker instead.
     """
     await upsert_role(address, role)
-    tx_id = push_role_on_chain(address, role)
-    if tx_id:
-        return f"Role '{role}' set for {address} — on-chain tx {tx_id}"
-    return f"Role '{role}' set locally for {address} (on-chain push skipped or failed)"
+    tx_id = await push_role_on_chain(address, role, wait=wait)
+    if tx_id is None:
+        return SetRoleResponse(
+            ok=True,
+            message=f"Role '{role}' set locally for {address} (on-chain push skipped or failed)",
+        )
+    if wait:
+        return SetRoleResponse(
+            ok=True,
+            message=f"Role '{role}' set for {address} — on-chain tx {tx_id}",
+            tx_id=tx_id,
+        )
+    await tx_uc.track(tx_id, "role")
+    return SetRoleResponse(
+        ok=True,
+        message=f"Role '{role}' set locally for {address} — on-chain tx {tx_id} pending",
+        tx_id=tx_id,
+    )
+
+
+# ── Bulk import ──────────────────────────────────────────
+
+def _parse_row(line: str, fmt: str) -> tuple[str, str]:
+    """Parse one CSV (``address,role``) or NDJSON line into (address, role)."""
+    if fmt == "ndjson":
+        obj = json.loads(line)
+        address, role = obj["address"], obj["role"]
+    else:
+        cells = next(csv.reader([line]))
+        address, role = cells[0], cells[1]
+    if not isinstance(address, str) or not isinstance(role, str):
+        raise ValueError("address and role must be strings")
+    address = address.strip()
+    role = Role(role.strip().lower()).value
+    if not encoding.is_valid_address(address):
+        raise ValueError("invalid Algorand address")
+    return address, role
+
+
+async def bulk_import(lines: Iterable[str], fmt: str) -> AsyncIterator[dict]:
+    """Import many roles: one SQLite transaction + packed on-chain groups.
+
+    Yields one progress record per row (``invalid`` / ``superseded`` /
+    ``stored`` / ``confirmed`` / ``failed``) and a final summary record.
+    When an address appears more than once the last row wins.
+    """
+    latest: dict[str, tuple[int, str]] = {}
+    invalid = 0
+    row_no = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if fmt == "csv" and row_no == 0 and line.lower().startswith("address"):
+            continue  # header
+        row_no += 1
+        if row_no > MAX_BULK_ROWS:
+            invalid += 1
+            yield {"row": row_no, "status": "invalid", "error": f"more than {MAX_BULK_ROWS} rows"}
+            break
+        try:
+            address, role = _parse_row(line, fmt)
+        except (ValueError, KeyError, IndexError, TypeError) as exc:
+            invalid += 1
+            yield {"row": row_no, "status": "invalid", "error": str(exc) or type(exc).__name__}
+            continue
+        prev = latest.get(address)
+        if prev is not None:
+            yield {"row": prev[0], "address": address, "status": "superseded", "by_row": row_no}
+        latest[address] = (row_no, role)
+
+    rows = [(row, address, role) for address, (row, role) in latest.items()]
+    assignments = [(address, role) for _, address, role in rows]
+    if assignments:
+        await upsert_roles(assignments)
+    for row, address, role in rows:
+        yield {"row": row, "address": address, "role": role, "status": "stored"}
+
+    confirmed = failed = 0
+    async for indices, tx_id in push_roles_on_chain(assignments):
+        status = "confirmed" if tx_id else "failed"
+        for idx in indices:
+            row, address, role = rows[idx]
+            yield {"row": row, "address": address, "role": role, "status": status, "tx_id": tx_id}
+        if tx_id:
+            confirmed += len(indices)
+        else:
+            failed += len(indices)
+
+    yield {
+        "done": True,
+        "rows": row_no,
+        "stored": len(rows),
+        "invalid": invalid,
+        "confirmed": confirmed,
+        "failed": failed,
+    }
@@ -3,18 +3,29 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache, partial
+from typing import AsyncIterator
 
-from app.domain.models import CreateSessionRequest, SessionResponse, SessionListResponse
+from algosdk import encoding
+
+from app.config import get_settings
+from app.domain.models import CreateSessionRequest, SessionResponse
+from app.domain.serialization import RowEncoder
+from app.infra.algorand.boxes import itob, iter_box_names
 from app.infra.algorand.chain import create_session_on_chain
 from app.infra.algorand.client import get_app_ids
+from app.infra.algorand.rounds import get_round_watcher
+from app.infra.cache import TTLCache
 from app.infra.db.models import insert_session, list_sessions, get_session
 
 logger = logging.getLogger(__name__)
 
+_session_encoder = RowEncoder(SessionResponse)
+
 
 async def create(req: CreateSessionRequest, creator: str) -> SessionResponse:
     """Create a session on-chain and cache in SQLite."""
-    session_id, tx_id = create_session_on_chain(
+    session_id, tx_id = await create_session_on_chain(
         course_code=req.course_code,
         session_ts=req.session_ts,
         open_round=req.open_round,
@@ -45,39 +56,56 @@ async def create(req: CreateSessionRequest, creator: str) -> SessionResponse:
     )
 
 
-async def list_all(limit: int = 100, offset: int = 0) -> SessionListResponse:
-    """List sessions from SQLite cache."""
-    rows = await list_sessions(limit=limit, offset=offset)
-    sessions = [
-        SessionResponse(
-            session_id=r["session_id"],
-            course_code=r["course_code"],
-            session_ts=r["session_ts"],
-            open_round=r["open_round"],
-            close_round=r["close_round"],
-            creator=r["creator"],
-            app_id=r["app_id"],
-            tx_id=r.get("tx_id"),
-            created=r.get("created"),
-        )
-        for r in rows
-    ]
-    return SessionListResponse(sessions=sessions, count=len(sessions))
-
-
-async def get_by_id(session_id: int) -> SessionResponse | None:
-    """Retrieve a single session from BFF cache."""
-    r = await get_session(session_id)
-    if r is None:
+async def list_json(limit: int = 100, cursor: str | None = None) -> bytes:
+    """Page of sessions from SQLite cache as ``SessionListResponse`` JSON."""
+    rows, next_cursor = await list_sessions(limit=limit, cursor=cursor)
+    return _session_encoder.encode_page("sessions", rows, next_cursor)
+
+
+async def get_json(session_id: int) -> bytes | None:
+    """Single session from BFF cache as ``SessionResponse`` JSON."""
+    row = await get_session(session_id)
+    return None if row is None else _session_encoder.encode(row)
+
+
+# ── Roster ───────────────────────────────────────────────
+
+@lru_cache
+def get_roster_cache() -> TTLCache[int, list[str]]:
+    # Only closed sessions are cached: no check-in can land after close_round.
+    return TTLCache(max_entries=get_settings().roster_cache_size, ttl=float("inf"))
+
+
+async def roster(session_id: int) -> AsyncIterator[list[str]] | None:
+    """Pages of addresses that checked in to the session, or None for an unknown session.
+
+    A closed session's roster is read once, sorted and cached.  While check-ins
+    can still land, pages are passed through as algod returns them.
+    """
+    row = await get_session(session_id)
+    if row is None:
         return None
-    return SessionResponse(
-        session_id=r["session_id"],
-        course_code=r["course_code"],
-        session_ts=r["session_ts"],
-        open_round=r["open_round"],
-        close_round=r["close_round"],
-        creator=r["creator"],
-        app_id=r["app_id"],
-        tx_id=r.get("tx_id"),
-        created=r.get("created"),
-    )
+    latest = get_round_watcher().latest  # 0 until the watcher has seen a block
+    if latest and latest > row["close_round"]:
+        load = partial(_read_roster, row["app_id"], session_id)
+        return _single_page(await get_roster_cache().get(session_id, load))
+    return _roster_pages(row["app_id"], session_id)
+
+
+async def _single_page(addresses: list[str]) -> AsyncIterator[list[str]]:
+    yield addresses
+
+
+async def _roster_pages(app_id: int, session_id: int) -> AsyncIterator[list[str]]:
+    # AttendanceContract.roster: key = b"r" + itob(session_id) + address (32 bytes)
+    prefix = b"r" + itob(session_id)
+    async for names in iter_box_names(app_id, prefix):
+        yield [encoding.encode_address(n[len(prefix):]) for n in names if len(n) == len(prefix) + 32]
+
+
+async def _read_roster(app_id: int, session_id: int) -> list[str]:
+    addresses: list[str] = []
+    async for page in _roster_pages(app_id, session_id):
+        addresses += page
+    addresses.sort()
+    return addresses
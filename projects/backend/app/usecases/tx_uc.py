@@ -1,24 +1,41 @@
-"""Transaction tracking use-case with background polling."""
+"""Transaction tracking use-case with a single block-driven confirmation watcher.
+
+One background task follows new rounds.  For each new round it fetches that
+block's transaction ids once (algod ``/v2/blocks/{round}/txids``) and matches
+them against every pending tx id, so upstream load grows with rounds, not with
+the number of tracked transactions.  Per-tx lookups are the exception: a tx
+reloaded from ``tx_tracking`` at startup (it may have confirmed while the BFF
+was down) and a tx that reaches its deadline without showing up in a block are
+each looked up once.  If block txids cannot be read (algod down, or a node
+without the route), the watcher backs off, up to ``_SCAN_BACKOFF_MAX``, and
+looks every pending tx up once per attempt instead.  A per-tx lookup checks
+algod pending info first, for pool errors, and then falls back to the Indexer.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from typing import Optional
+
+from algosdk.error import AlgodHTTPError
 
+from app.config import get_settings
 from app.infra.db.models import upsert_tx, get_tx, list_pending_txs
+from app.infra.algorand.client import get_algod
+from app.infra.algorand.gateway import run_algod, run_indexer
 from app.infra.algorand.indexer import lookup_tx as indexer_lookup
+from app.infra.algorand.rounds import get_round_watcher
 from app.domain.models import TxStatus
 
 logger = logging.getLogger(__name__)
 
 
 async def track(tx_id: str, kind: str) -> TxStatus:
-    """Record a tx and kick off a background task to poll for confirmation."""
+    """Record a tx and hand it to the confirmation watcher."""
     await upsert_tx(tx_id, kind)
-
-    # Fire-and-forget polling
-    asyncio.create_task(_poll_tx(tx_id))
-
+    _watcher.add(tx_id, kind)
     return TxStatus(tx_id=tx_id, kind=kind, status="pending")
 
 
@@ -34,26 +51,189 @@ async def get_status(tx_id: str) -> TxStatus | None:
     )
 
 
-async def _poll_tx(tx_id: str, max_attempts: int = 30, interval: float = 2.0) -> None:
-    """Poll algod/indexer until the transaction is confirmed or we give up."""
-    for _ in range(max_attempts):
-        await asyncio.sleep(interval)
-        try:
-            info = indexer_lookup(tx_id)
-            if info and info.get("confirmed-round"):
-                await upsert_tx(
-                    tx_id,
-                    kind="",  # kind already stored — upsert keeps it
-                    status="confirmed",
-                    confirmed_round=info["confirmed-round"],
+# ── Confirmation watcher ─────────────────────────────────
+
+async def _lookup(tx_id: str) -> Optional[tuple[str, Optional[int]]]:
+    """Return (status, confirmed_round) once settled, or None while still pending."""
+    try:
+        info = await run_algod(get_algod().pending_transaction_info, tx_id)
+        if info.get("confirmed-round"):
+            return "confirmed", info["confirmed-round"]
+        if info.get("pool-error"):
+            logger.warning("tx %s rejected from pool: %s", tx_id, info["pool-error"])
+            return "failed", None
+        return None  # still in the pool
+    except AlgodHTTPError as exc:
+        if exc.code != 404:
+            logger.debug("algod pending info failed for %s", tx_id, exc_info=True)
+    except Exception:
+        logger.debug("algod pending info failed for %s", tx_id, exc_info=True)
+
+    # algod forgets txs shortly after confirmation — ask the Indexer.
+    info = await run_indexer(indexer_lookup, tx_id)
+    if info and info.get("confirmed-round"):
+        return "confirmed", info["confirmed-round"]
+    return None
+
+
+# A transaction is only valid for 1000 rounds, so older blocks never need scanning.
+_MAX_SCAN_ROUNDS = 1000
+# Retry delay after a failed block scan (doubles up to the max)
+_SCAN_BACKOFF_MIN = 1.0
+_SCAN_BACKOFF_MAX = 30.0
+
+
+async def _block_txids(rnd: int) -> set[str]:
+    resp = await run_algod(get_algod().get_block_txids, rnd)
+    return set(resp.get("blockTxids") or [])
+
+
+class _TxWatcher:
+    def __init__(self) -> None:
+        self._pending: dict[str, tuple[str, float]] = {}  # tx_id -> (kind, deadline)
+        self._next_round = 0  # first round not yet scanned
+        self._task: Optional[asyncio.Task] = None
+        self.blocks = 0
+        self.scan_failures = 0
+        self.lookups = 0
+        self.confirmed = 0
+        self.failed = 0
+
+    def add(self, tx_id: str, kind: str) -> None:
+        timeout = get_settings().tx_watch_timeout
+        self._pending[tx_id] = (kind, time.monotonic() + timeout)
+        # The tx may land in the round the watcher has just seen: rescan it.
+        latest = get_round_watcher().latest
+        if latest and (not self._next_round or self._next_round > latest):
+            self._next_round = latest
+
+    async def start(self) -> None:
+        rows = await list_pending_txs()
+        for row in rows:
+            self.add(row["tx_id"], row["kind"])
+        if rows:
+            logger.info("tx watcher resuming %d pending txs", len(rows))
+        self._task = asyncio.create_task(self._run([r["tx_id"] for r in rows]), name="tx-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, resumed: list[str]) -> None:
+        # These may have confirmed while we were down: settle them individually once.
+        await asyncio.gather(*(self._settle_by_lookup(t, final=False) for t in resumed))
+        rounds = get_round_watcher()
+        idle_wait = get_settings().tx_watch_timeout
+        backoff = 0.0
+        while True:
+            if not self._next_round and rounds.latest:
+                self._next_round = rounds.latest
+            # Wake on the next block, or when the earliest deadline passes even if no block comes.
+            deadline = min((d for _, d in self._pending.values()), default=None)
+            timeout = idle_wait if deadline is None else max(0.0, deadline - time.monotonic())
+            if backoff:
+                # The last scan failed: the missed rounds are already "new", so waiting
+                # on the next block would return at once.  Sleep instead.
+                await asyncio.sleep(min(backoff, timeout))
+            else:
+                try:
+                    await asyncio.wait_for(rounds.wait_after(max(self._next_round - 1, 0)), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            try:
+                await self._scan_new_rounds(rounds.latest)
+                backoff = 0.0
+            except Exception as exc:
+                backoff = min(backoff * 2 or _SCAN_BACKOFF_MIN, _SCAN_BACKOFF_MAX)
+                self.scan_failures += 1
+                logger.warning(
+                    "tx watcher: block txids unavailable (%s); per-tx lookups, next scan in %.0fs", exc, backoff
                 )
-                logger.info("tx %s confirmed at round %d", tx_id, info["confirmed-round"])
-                return
+                await self._settle_pending_by_lookup(rounds.latest)
+            try:
+                await self._expire()
+            except Exception:
+                logger.exception("tx watcher expiry failed")
+
+    async def _scan_new_rounds(self, latest: int) -> None:
+        if not latest or not self._next_round:
+            return
+        first = max(self._next_round, latest - _MAX_SCAN_ROUNDS + 1)
+        for rnd in range(first, latest + 1):
+            if self._pending:
+                txids = await _block_txids(rnd)
+                self.blocks += 1
+                for tx_id in txids.intersection(self._pending):
+                    await self._settle(tx_id, "confirmed", rnd)
+            self._next_round = rnd + 1
+
+    async def _settle_pending_by_lookup(self, latest: int) -> None:
+        """Fallback while block txids cannot be read: look every pending tx up once."""
+        results = await asyncio.gather(
+            *(self._settle_by_lookup(t, final=False) for t in list(self._pending)), return_exceptions=True
+        )
+        if not any(isinstance(r, Exception) for r in results) and latest:
+            self._next_round = max(self._next_round, latest + 1)  # those rounds are covered
+
+    async def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [t for t, (_, deadline) in self._pending.items() if deadline <= now]
+        await asyncio.gather(*(self._settle_by_lookup(t, final=True) for t in expired))
+
+    async def _settle_by_lookup(self, tx_id: str, *, final: bool) -> None:
+        """One per-tx lookup; with ``final`` a tx that is still unknown is marked failed."""
+        self.lookups += 1
+        try:
+            result = await _lookup(tx_id)
         except Exception:
-            logger.debug("poll attempt failed for %s", tx_id, exc_info=True)
+            logger.debug("lookup failed for %s", tx_id, exc_info=True)
+            result = None
+        if result is None:
+            if not final:
+                return
+            logger.warning("tx %s timed out – marked failed", tx_id)
+            result = ("failed", None)
+        await self._settle(tx_id, *result)
 
-    # Give up
-    row = await get_tx(tx_id)
-    if row and row["status"] == "pending":
-        await upsert_tx(tx_id, kind=row["kind"], status="failed")
-        logger.warning("tx %s timed out – marked failed", tx_id)
+    async def _settle(self, tx_id: str, status: str, confirmed_round: Optional[int]) -> None:
+        entry = self._pending.pop(tx_id, None)
+        if entry is None:
+            return
+        await upsert_tx(tx_id, kind=entry[0], status=status, confirmed_round=confirmed_round)
+        if status == "confirmed":
+            self.confirmed += 1
+            logger.info("tx %s confirmed at round %d", tx_id, confirmed_round)
+        else:
+            self.failed += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "next_round": self._next_round,
+            "blocks_scanned": self.blocks,
+            "scan_failures": self.scan_failures,
+            "per_tx_lookups": self.lookups,
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+        }
+
+
+_watcher = _TxWatcher()
+
+
+async def start_watcher() -> None:
+    """Resume pending rows from ``tx_tracking`` and start the watcher task."""
+    await _watcher.start()
+
+
+async def stop_watcher() -> None:
+    await _watcher.stop()
+
+
+def watcher_stats() -> dict[str, int]:
+    return _watcher.stats()
@@ -0,0 +1,27 @@
+"""Shared fixtures: a fresh SQLite database and per-test chain singletons."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+
+from app.infra.algorand.gateway import shutdown_gateway
+from app.infra.algorand.rounds import get_round_watcher
+from app.infra.db.database import close_db, init_db
+
+
+@pytest.fixture(autouse=True)
+def _fresh_chain_singletons() -> None:
+    # Both hold asyncio primitives bound to the loop of the test that created them.
+    get_round_watcher.cache_clear()
+    shutdown_gateway()
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> AsyncIterator[Path]:
+    path = tmp_path / "test.db"
+    await init_db(path)
+    yield path
+    await close_db()
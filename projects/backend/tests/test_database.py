@@ -0,0 +1,54 @@
+"""Group-commit writer: durability of queued writes across close()."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.infra.db import database
+from app.infra.db.models import get_tx, upsert_tx
+
+
+async def test_writes_resolve_after_commit(db: Path) -> None:
+    await asyncio.gather(*(upsert_tx(f"tx{i}", "role") for i in range(20)))
+    row = await get_tx("tx7")
+    assert row is not None and row["status"] == "pending"
+    assert database.pool_stats()["commits"] >= 1
+
+
+async def test_close_flushes_queued_and_in_flight_writes(tmp_path: Path) -> None:
+    path = tmp_path / "close.db"
+    await database.init_db(path)
+    database._require()._window = 0.05  # keep a batch open inside the writer while close() runs
+
+    writes = [asyncio.create_task(upsert_tx(f"tx{i}", "role")) for i in range(50)]
+    await asyncio.sleep(0.01)
+    await database.close_db()
+
+    results = await asyncio.wait_for(asyncio.gather(*writes, return_exceptions=True), 5)
+    assert results == [None] * 50
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM tx_tracking").fetchone()[0] == 50
+
+
+async def test_write_after_close_is_refused(tmp_path: Path) -> None:
+    await database.init_db(tmp_path / "refuse.db")
+    db = database._require()
+    await database.close_db()
+    with pytest.raises(RuntimeError):
+        await db.run_write(lambda conn: conn.execute("SELECT 1"))
+
+
+async def test_failing_write_does_not_sink_its_batch(db: Path) -> None:
+    async def _bad(conn):
+        await conn.execute("INSERT INTO no_such_table VALUES (1)")
+
+    good, bad = await asyncio.gather(
+        upsert_tx("ok", "role"), database.run_write(_bad), return_exceptions=True
+    )
+    assert good is None
+    assert isinstance(bad, sqlite3.OperationalError)
+    assert await get_tx("ok") is not None
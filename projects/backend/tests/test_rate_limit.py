@@ -0,0 +1,75 @@
+"""Token buckets: eviction in the in-process table, sharing in the mmap tables."""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from app.rate_limit import (
+    RateLimiter,
+    SharedBucketTable,
+    SharedConcurrencyGate,
+    SharedGateTable,
+    SharedRateLimiter,
+)
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="shared backend needs fcntl")
+
+
+def test_bucket_limits_and_reports_retry_after() -> None:
+    limiter = RateLimiter(capacity=3, refill_per_sec=1.0)
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a") > 0.0
+    assert limiter.acquire("b") == 0.0  # other clients are unaffected
+
+
+def test_cap_evicts_least_recently_used() -> None:
+    limiter = RateLimiter(capacity=5, refill_per_sec=0.001, max_buckets=3)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key)
+    limiter.acquire("a")  # touch: "b" is now the oldest
+    limiter.acquire("d")
+    assert limiter.stats()["buckets"] == 3
+    assert limiter.evicted == 1
+    assert set(limiter._buckets) == {"c", "a", "d"}
+
+
+def test_refilled_buckets_are_dropped() -> None:
+    limiter = RateLimiter(capacity=1, refill_per_sec=1000.0)  # full again after 1 ms
+    for i in range(100):
+        limiter.acquire(f"ip{i}")
+    time.sleep(0.01)
+    limiter.acquire("new")
+    assert limiter.stats()["buckets"] == 1
+
+
+@posix_only
+def test_shared_table_is_shared_between_mappings(tmp_path: Path) -> None:
+    path = tmp_path / "buckets.bin"
+    one = SharedRateLimiter(SharedBucketTable(path, 64), "/auth/", 2, 0.001)
+    two = SharedRateLimiter(SharedBucketTable(path, 64), "/auth/", 2, 0.001)
+    assert one.acquire("ip:1") == 0.0
+    assert two.acquire("ip:1") == 0.0
+    assert one.acquire("ip:1") > 0.0
+    assert two.acquire("ip:2") == 0.0
+
+
+@posix_only
+def test_shared_table_reuses_slots_when_full(tmp_path: Path) -> None:
+    table = SharedBucketTable(tmp_path / "small.bin", 8)
+    for i in range(100):  # far more keys than slots: victims are replaced, never an error
+        assert table.acquire(f"k{i}", 1, 0.001) == 0.0
+
+
+@posix_only
+def test_shared_gate_counts_across_mappings(tmp_path: Path) -> None:
+    path = tmp_path / "gates.bin"
+    one = SharedConcurrencyGate(SharedGateTable(path, 16), "/faculty/", 2)
+    two = SharedConcurrencyGate(SharedGateTable(path, 16), "/faculty/", 2)
+    assert one.try_enter() and two.try_enter()
+    assert not one.try_enter()
+    two.leave()
+    assert one.try_enter()
@@ -0,0 +1,98 @@
+"""Block-driven tx watcher: matching, deadline expiry and algod-failure backoff."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.config import get_settings
+from app.infra.algorand.rounds import get_round_watcher
+from app.infra.db.models import get_tx
+from app.usecases import tx_uc
+
+
+class FakeAlgod:
+    def __init__(self, blocks: dict[int, list[str]] | None = None, confirmed: dict[str, int] | None = None):
+        self.blocks = blocks
+        self.confirmed = confirmed or {}
+        self.block_calls = 0
+        self.pending_calls = 0
+
+    def get_block_txids(self, rnd: int) -> dict[str, Any]:
+        self.block_calls += 1
+        if self.blocks is None:
+            raise ConnectionError("algod unreachable")
+        return {"blockTxids": self.blocks.get(rnd, [])}
+
+    def pending_transaction_info(self, tx_id: str) -> dict[str, Any]:
+        self.pending_calls += 1
+        if tx_id in self.confirmed:
+            return {"confirmed-round": self.confirmed[tx_id]}
+        return {}
+
+
+@pytest.fixture
+async def watcher(db: Path, monkeypatch: pytest.MonkeyPatch):
+    async def _no_indexer(*_args: Any) -> None:
+        return None
+
+    monkeypatch.setattr(get_settings(), "tx_watch_timeout", 0.5)
+    monkeypatch.setattr(tx_uc, "run_indexer", _no_indexer)
+    w = tx_uc._TxWatcher()
+    monkeypatch.setattr(tx_uc, "_watcher", w)
+    get_round_watcher().latest = 10
+    yield w
+    await w.stop()
+
+
+async def _status(tx_id: str) -> str:
+    row = await get_tx(tx_id)
+    return row["status"]
+
+
+async def test_confirms_from_block_txids(watcher, monkeypatch: pytest.MonkeyPatch) -> None:
+    algod = FakeAlgod(blocks={11: [f"T{i}" for i in range(0, 40, 2)]})
+    monkeypatch.setattr(tx_uc, "get_algod", lambda: algod)
+    await watcher.start()
+    for i in range(40):
+        await tx_uc.track(f"T{i}", "role")
+
+    get_round_watcher()._advance(11)
+    await asyncio.sleep(0.1)
+
+    assert await _status("T2") == "confirmed"
+    assert (await get_tx("T2"))["confirmed_round"] == 11
+    assert await _status("T3") == "pending"
+    assert algod.block_calls == 2  # rounds 10 and 11, however many txs are tracked
+    assert algod.pending_calls == 0
+
+
+async def test_unconfirmed_txs_expire(watcher, monkeypatch: pytest.MonkeyPatch) -> None:
+    algod = FakeAlgod(blocks={})
+    monkeypatch.setattr(tx_uc, "get_algod", lambda: algod)
+    await watcher.start()
+    await tx_uc.track("lost", "role")
+
+    await asyncio.sleep(0.8)  # no new block arrives at all
+
+    assert await _status("lost") == "failed"
+    assert algod.pending_calls == 1  # one final lookup at the deadline
+
+
+async def test_backs_off_and_falls_back_when_block_txids_fail(watcher, monkeypatch: pytest.MonkeyPatch) -> None:
+    algod = FakeAlgod(blocks=None, confirmed={"A": 11})
+    monkeypatch.setattr(tx_uc, "get_algod", lambda: algod)
+    await watcher.start()
+    await tx_uc.track("A", "role")
+    await tx_uc.track("B", "role")
+
+    get_round_watcher()._advance(11)
+    await asyncio.sleep(0.8)
+
+    assert algod.block_calls <= 2  # backed off instead of spinning
+    assert watcher.scan_failures >= 1
+    assert await _status("A") == "confirmed"  # found by the per-tx fallback
+    assert await _status("B") == "failed"  # expiry still ran